@@ -23,11 +23,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'zoo.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'zoo.db.ReplicaPinningMiddleware',
+    'zoo.staticfiles.PrecompressedStaticMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'zoo.middleware.RoleMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'zoo.middleware.AnimalViewCounterMiddleware',
@@ -52,15 +56,44 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'virtualzoo.wsgi.application'
+ASGI_APPLICATION = 'virtualzoo.asgi.application'  # e.g. uvicorn virtualzoo.asgi:application
 
 # Database
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # Keep connections (and their PRAGMAs and page cache) across requests.
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'timeout': 20},
     }
 }
 
+# Applied to every SQLite connection (zoo.db.configure_connection).
+ZOO_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,  # ms
+    'cache_size': -64000,  # KiB, i.e. 64 MB per connection
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Optional read replica: a snapshot file refreshed by the refreshreplica command.
+ZOO_SQLITE_REPLICA = None  # e.g. os.path.join(BASE_DIR, 'db-replica.sqlite3')
+ZOO_SQLITE_REPLICA_MODELS = ['zoo.Animal', 'zoo.Category', 'zoo.Zone', 'zoo.Fact', 'zoo.Blog', 'zoo.Quiz']
+ZOO_SQLITE_REPLICA_PIN = 5 * 60  # seconds a browser reads from the primary after writing
+if ZOO_SQLITE_REPLICA:
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ZOO_SQLITE_REPLICA,
+        # The file is swapped out on refresh; a persistent connection would keep reading the old one.
+        'CONN_MAX_AGE': 0,
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['zoo.db.ReplicaRouter']
+
 # Passwords
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -82,6 +115,12 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    # collectstatic writes content-hashed names plus .gz/.br siblings (zoo.staticfiles).
+    'staticfiles': {'BACKEND': 'zoo.staticfiles.PrecompressedManifestStaticFilesStorage'},
+}
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
@@ -91,3 +130,97 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Login
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
+
+# Write-behind animal view counters (zoo.counters)
+ZOO_VIEW_COUNTER_FLUSH_INTERVAL = 10  # seconds between batched writes
+ZOO_VIEW_COUNTER_MAX_PENDING = 1000  # flush early once this many animals are buffered
+ZOO_VIEW_COUNTER_CACHE = None  # alias of a cache shared by all workers (not locmem); needed by flushviewcounts
+
+# Cached site statistics (zoo.stats)
+ZOO_STATS_CACHE = None  # alias of a cache shared by all workers (not locmem); otherwise cached per worker briefly
+ZOO_STATS_CACHE_TIMEOUT = 60 * 60  # in ZOO_STATS_CACHE
+ZOO_STATS_LOCAL_CACHE_TIMEOUT = 30  # in each worker's own cache
+
+# Keyset pagination (zoo.pagination)
+ZOO_PAGE_SIZE = 24
+
+# Materialized dashboard (zoo.dashboard); rebuilt inline once older than this
+ZOO_DASHBOARD_MAX_AGE = 5 * 60  # seconds
+
+# Responsive image derivatives (zoo.images)
+ZOO_IMAGE_DERIVATIVE_WORKERS = 2  # background threads generating variants after upload
+ZOO_IMAGE_DERIVATIVES_SYNC = False  # generate inline instead (useful in tests)
+
+# Background jobs (zoo.jobs); processed by `manage.py runjobs`
+ZOO_JOB_MAX_ATTEMPTS = 5
+ZOO_JOB_BACKOFF_BASE = 30  # seconds; doubles after every failed attempt
+ZOO_JOB_LOCK_TIMEOUT = 10 * 60  # requeue jobs left running longer than this
+
+# Request instrumentation (zoo.middleware.PerformanceMiddleware)
+ZOO_PERF_ENABLED = True
+ZOO_PERF_SLOW_REQUEST_MS = 500
+ZOO_PERF_SLOW_QUERY_MS = 100
+ZOO_PERF_N_PLUS_ONE_THRESHOLD = 5  # identical statements per request before warning
+ZOO_PERF_SERVER_TIMING = None  # None: Server-Timing header only in DEBUG or for staff; True/False: always/never
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'zoo.performance': {'handlers': ['console'], 'level': 'WARNING'},
+    },
+}
+
+# Quiz engine (zoo.quiz)
+ZOO_QUIZ_QUESTIONS = 5  # questions sampled per attempt
+ZOO_QUIZ_CACHE_TIMEOUT = 5 * 60  # seconds; bounds how long other workers see an edited question
+
+# Cached Profile.role lookups (zoo.roles)
+ZOO_ROLE_CACHE = None  # alias of a cache shared by all workers (not locmem); otherwise read per request
+ZOO_ROLE_CACHE_TIMEOUT = 60 * 60
+
+# Per-user favorite sets (zoo.favorites)
+ZOO_FAVORITES_CACHE = None  # alias of a cache shared by all workers (not locmem); otherwise read per request
+ZOO_FAVORITES_CACHE_TIMEOUT = 60 * 60  # bounds drift from writes that bypass signals
+
+# Trending animals (zoo.trending)
+ZOO_TRENDING_HOURLY_RETENTION = 48  # hours kept at hourly resolution before compacttrending folds them into days
+ZOO_TRENDING_DAILY_RETENTION = 30  # days of daily buckets kept
+ZOO_TRENDING_CACHE_TIMEOUT = 60  # seconds a computed ranking is reused
+
+# Anonymous full-page cache (zoo.pagecache)
+ZOO_PAGE_CACHE_ENABLED = True
+ZOO_PAGE_CACHE_TIMEOUT = 60  # seconds; bounds staleness from data not tracked by generations (trending, view counts)
+ZOO_PAGE_CACHE_STALE_TIMEOUT = 60 * 60  # last good copy served while another request re-renders
+ZOO_PAGE_CACHE_LOCK_TIMEOUT = 10
+ZOO_PAGE_CACHE_WAIT = 2  # seconds to wait for a concurrent render when there is no stale copy
+
+# Animal audio/video streaming (zoo.media)
+ZOO_MEDIA_MAX_AGE = 24 * 60 * 60
+ZOO_MEDIA_MAX_RANGES = 16  # Range headers with more parts are ignored (full response)
+ZOO_MEDIA_ACCEL = None  # 'nginx' (X-Accel-Redirect) or 'apache' (X-Sendfile) to hand files to the web server
+ZOO_MEDIA_ACCEL_PREFIX = '/protected-media/'  # internal nginx location aliased to MEDIA_ROOT
+
+# "Also liked" recommendations (zoo.recommend; recompute with the recommendneighbors command)
+ZOO_RECOMMEND_TOP_K = 12  # neighbors stored per animal
+ZOO_RECOMMEND_DISPLAY = 6  # shown on the animal detail page
+ZOO_RECOMMEND_MIN_SHARED = 1  # visitors two animals must share to be neighbors
+ZOO_RECOMMEND_MAX_USER_FAVORITES = 500  # visitors with more favorites are left out of the counts
+ZOO_RECOMMEND_BATCH_SIZE = 200  # animals per co-occurrence query; bounds memory
+
+# Blog Markdown rendering (zoo.markup; backfill with the renderblogs command)
+ZOO_BLOG_EXCERPT_WORDS = 30
+ZOO_BLOG_WORDS_PER_MINUTE = 200  # for the reading-time estimate
+
+# Read-only JSON API (zoo.api)
+ZOO_API_MAX_PAGE_SIZE = 100
+ZOO_API_MAX_BATCH = 100  # ids accepted by api/<resource>/batch/
+ZOO_API_MAX_AGE = 30  # Cache-Control max-age; clients revalidate with the ETag afterwards
+
+# Static files (zoo.staticfiles)
+ZOO_STATIC_SERVE = not DEBUG  # serve STATIC_ROOT from Django when no front-end server does
+ZOO_STATIC_MAX_AGE = 60 * 60  # Cache-Control for unhashed names; hashed names are immutable for a year
+ZOO_STATIC_IMAGE_MAX_WIDTH = 1600  # collectstatic downsizes wider images
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from .models import (
-    Profile, Category, Animal, Fact, Blog, Zone, Feedback, Favorite, Quiz, ContactMessage
+    Profile, Category, Animal, Fact, Blog, Zone, Feedback, Favorite, Quiz, ContactMessage, Job
 )
 
 
@@ -51,6 +51,13 @@ class FavoriteAdmin(admin.ModelAdmin):
 
 @admin.register(Quiz)
 class QuizAdmin(admin.ModelAdmin):
-    list_display = ('question',)
+    list_display = ('question', 'category', 'difficulty')
+    list_filter = ('difficulty', 'category')
 
 admin.site.register(ContactMessage)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('task', 'status', 'attempts', 'run_at', 'created_at')
+    list_filter = ('status', 'task')
@@ -0,0 +1,185 @@
+"""Read-only JSON API.
+
+Every endpoint reads with ``.values()`` (related names come from the same
+JOINed query), so no model instances are built. Clients can:
+
+- page through lists with the ``?after=``/``?before=`` keyset cursors
+  from zoo.pagination,
+- ask for only the fields they need with ``?fields=a,b`` (only those
+  columns are selected),
+- fetch up to ZOO_API_MAX_BATCH objects at once with ``batch/?ids=1,2,3``,
+- revalidate with If-None-Match: responses carry an ETag of their body.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from .models import Animal, Blog, Category, Fact, Zone
+from .pagination import paginate
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _file_url(name):
+    return default_storage.url(name) if name else None
+
+
+class Resource:
+    def __init__(self, queryset, ordering, fields, default_fields=None, transforms=None):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        # Public field name -> ORM path passed to values().
+        self.fields = fields
+        self.default_fields = list(default_fields or fields)
+        self.transforms = transforms or {}
+
+    def values(self, names):
+        """values() queryset selecting ``names`` plus the columns the cursor needs."""
+        paths = [self.fields[name] for name in names]
+        for field in self.ordering:
+            if field.lstrip('-') not in paths:
+                paths.append(field.lstrip('-'))
+        return self.queryset.all().values(*paths)
+
+    def serialize(self, row, names):
+        item = {}
+        for name in names:
+            value = row[self.fields[name]]
+            transform = self.transforms.get(name)
+            item[name] = transform(value) if transform else value
+        return item
+
+
+RESOURCES = {
+    'animals': Resource(
+        Animal.objects.all(),
+        ordering=('-created_at', '-id'),
+        fields={
+            'id': 'id',
+            'name': 'name',
+            'species': 'species',
+            'scientific_name': 'scientific_name',
+            'category': 'category__slug',
+            'category_name': 'category__name',
+            'zone': 'zone__name',
+            'description': 'description',
+            'diet': 'diet',
+            'habitat': 'habitat',
+            'fun_facts': 'fun_facts',
+            'image': 'image',
+            'sound': 'sound',
+            'video': 'video',
+            'view_count': 'view_count',
+            'favorite_count': 'favorite_count',
+            'created_at': 'created_at',
+            'updated_at': 'updated_at',
+        },
+        default_fields=['id', 'name', 'species', 'category', 'zone', 'image', 'created_at'],
+        transforms={'image': _file_url, 'sound': _file_url, 'video': _file_url},
+    ),
+    'categories': Resource(
+        Category.objects.all(),
+        ordering=('id',),
+        fields={'id': 'id', 'name': 'name', 'slug': 'slug', 'description': 'description'},
+    ),
+    'zones': Resource(
+        Zone.objects.all(),
+        ordering=('id',),
+        fields={'id': 'id', 'name': 'name', 'description': 'description', 'map_location': 'map_location'},
+    ),
+    'facts': Resource(
+        Fact.objects.all(),
+        ordering=('id',),
+        fields={'id': 'id', 'title': 'title', 'content': 'content'},
+    ),
+    'blogs': Resource(
+        Blog.objects.filter(approved=True),
+        ordering=('-date_posted', '-id'),
+        fields={
+            'id': 'id',
+            'title': 'title',
+            'content': 'content',
+            'content_html': 'content_html',
+            'excerpt': 'excerpt',
+            'reading_time': 'reading_time',
+            'author': 'author__username',
+            'date_posted': 'date_posted',
+            'updated_at': 'updated_at',
+        },
+        default_fields=['id', 'title', 'excerpt', 'author', 'date_posted'],
+    ),
+}
+
+
+def parse_fields(resource, raw):
+    """Field names requested with ``?fields=``; raises ValueError on unknown names."""
+    if not raw:
+        return list(resource.default_fields)
+    if raw == '*':
+        return list(resource.fields)
+    names = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = [name for name in names if name not in resource.fields]
+    if unknown:
+        raise ValueError(f'Unknown field(s): {", ".join(unknown)}. Available: {", ".join(resource.fields)}')
+    return names
+
+
+def valid_id(resource, pk):
+    """True if ``pk`` fits the primary key column (the database rejects larger integers)."""
+    try:
+        resource.queryset.model._meta.pk.run_validators(pk)
+    except ValidationError:
+        return False
+    return True
+
+
+def parse_ids(resource, raw):
+    try:
+        ids = [int(part) for part in raw.split(',') if part.strip()]
+    except ValueError:
+        raise ValueError('ids must be a comma-separated list of integers')
+    limit = _setting('ZOO_API_MAX_BATCH', 100)
+    if len(ids) > limit:
+        raise ValueError(f'At most {limit} ids per request')
+    out_of_range = [str(pk) for pk in ids if not valid_id(resource, pk)]
+    if out_of_range:
+        raise ValueError(f'Invalid id(s): {", ".join(out_of_range)}')
+    return ids
+
+
+def list_page(request, resource, names, per_page):
+    page = paginate(request, resource.values(names), resource.ordering, per_page=per_page)
+    return {
+        'results': [resource.serialize(row, names) for row in page],
+        'next': f'{request.path}?{page.next_query}' if page.next_query else None,
+        'previous': f'{request.path}?{page.previous_query}' if page.previous_query else None,
+    }
+
+
+def get_many(resource, ids, names):
+    """Objects for ``ids`` in request order, plus the ids that were not found."""
+    if 'id' not in names:
+        names = ['id', *names]
+    rows = {row['id']: row for row in resource.values(names).filter(pk__in=ids)}
+    found = [resource.serialize(rows[pk], names) for pk in dict.fromkeys(ids) if pk in rows]
+    return found, [pk for pk in ids if pk not in rows]
+
+
+def json_response(request, data):
+    """JSON response with a strong ETag; 304 when the client already has this body."""
+    body = json.dumps(data, cls=DjangoJSONEncoder).encode('utf-8')
+    etag = '"%s"' % hashlib.md5(body).hexdigest()
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=_setting('ZOO_API_MAX_AGE', 30))
+    return response
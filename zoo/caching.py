@@ -0,0 +1,27 @@
+"""Helpers for caches that must be visible to every worker process.
+
+Without a CACHES setting Django uses a local-memory cache, which each
+worker process keeps to itself: a value cached by one worker is not
+seen, nor invalidated, by the others. Data that is invalidated by
+signals (roles, favorites) or drained by a separate process (view
+counters) is only cached in a cache shared by all workers, such as
+Redis, Memcached, the database or the file system.
+"""
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def is_shared(cache):
+    """True if ``cache`` is visible to every worker process."""
+    return not isinstance(cache, PROCESS_LOCAL_BACKENDS)
+
+
+def shared_cache(alias):
+    """The cache named ``alias`` if it is shared between workers, else None."""
+    if not alias:
+        return None
+    cache = caches[alias]
+    return cache if is_shared(cache) else None
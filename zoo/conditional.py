@@ -0,0 +1,62 @@
+"""Conditional GET (ETag / Last-Modified) for detail pages.
+
+The validators come from a single ``values_list('updated_at')`` primary-key
+lookup (for animals, joined with the time their "also liked" list last
+changed), memoized on the request, so a revalidation that ends in 304 Not
+Modified does not load the object or render the template.
+
+Pages for logged-in users also show per-user state (username, role, the
+favorite button, the CSRF token), so their ETag mixes that state in and
+they get no Last-Modified: a timestamp alone cannot tell that the user
+favorited the animal since the last visit.
+"""
+import hashlib
+
+from django.conf import settings
+from django.views.decorators.http import condition
+
+from .favorites import favorite_ids
+from .models import Animal
+from .pagecache import has_pending_messages
+from .roles import get_role
+
+
+def _updated_at(request, model, pk):
+    memo = request.__dict__.setdefault('_zoo_updated_at', {})
+    key = (model, pk)
+    if key not in memo:
+        fields = ['updated_at']
+        if model is Animal:
+            # The "also liked" list is recomputed offline without touching the animal.
+            fields.append('neighbors__updated_at')
+        row = model.objects.filter(pk=pk).values_list(*fields).first()
+        memo[key] = max(value for value in row if value is not None) if row else None
+    return memo[key]
+
+
+def _etag(model):
+    def etag(request, pk):
+        updated_at = _updated_at(request, model, pk)
+        if updated_at is None or has_pending_messages(request):
+            return None
+        parts = [model._meta.label_lower, str(pk), updated_at.isoformat()]
+        user = request.user
+        if user.is_authenticated:
+            parts += [str(user.pk), get_role(request), request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')]
+            if model is Animal:
+                parts.append('fav' if pk in favorite_ids(user) else '')
+        return hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+    return etag
+
+
+def _last_modified(model):
+    def last_modified(request, pk):
+        if request.user.is_authenticated or has_pending_messages(request):
+            return None
+        return _updated_at(request, model, pk)
+    return last_modified
+
+
+def detail_condition(model):
+    """``condition()`` decorator for a detail view taking ``pk``."""
+    return condition(etag_func=_etag(model), last_modified_func=_last_modified(model))
@@ -0,0 +1,181 @@
+"""Write-behind view counters.
+
+Animal detail hits are accumulated in memory (and optionally in a shared
+cache) and written back periodically as one ``F()`` update per distinct
+increment, instead of one read + save per page view. Each flush also
+adds the counts to the hourly view buckets used by zoo.trending.
+
+Flushes happen on the request that finds the interval elapsed and, so
+that counts do not wait for the next hit, on a daemon timer thread
+started by the first buffered view in each process.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, transaction
+from django.db.models import F
+
+CACHE_KEY_PREFIX = 'zoo:views:'
+
+logger = logging.getLogger(__name__)
+
+
+def _flush_interval():
+    return getattr(settings, 'ZOO_VIEW_COUNTER_FLUSH_INTERVAL', 10)
+
+
+def _max_pending():
+    return getattr(settings, 'ZOO_VIEW_COUNTER_MAX_PENDING', 1000)
+
+
+def _shared_cache():
+    alias = getattr(settings, 'ZOO_VIEW_COUNTER_CACHE', None)
+    return caches[alias] if alias else None
+
+
+class ViewCounterBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = defaultdict(int)
+        self._last_flush = time.monotonic()
+        self._timer_pid = None
+
+    def increment(self, animal_id, amount=1):
+        if self.add(animal_id, amount):
+            self.flush_logged()
+
+    def add(self, animal_id, amount=1):
+        """Count ``amount`` views without flushing; return True if a flush is due."""
+        cache = _shared_cache()
+        with self._lock:
+            self._start_timer()
+            if cache is not None:
+                key = f'{CACHE_KEY_PREFIX}{animal_id}'
+                if not cache.add(key, amount, timeout=None):
+                    cache.incr(key, amount)
+                # Remember the id so this worker knows which keys to drain.
+                self._pending.setdefault(animal_id, 0)
+            else:
+                self._pending[animal_id] += amount
+            return self._flush_due() or len(self._pending) >= _max_pending()
+
+    def _flush_due(self):
+        return time.monotonic() - self._last_flush >= _flush_interval()
+
+    def _start_timer(self):
+        # Called with the lock held. Threads do not survive fork(), so a
+        # worker forked from a preloaded parent starts its own.
+        if self._timer_pid == os.getpid():
+            return
+        self._timer_pid = os.getpid()
+        threading.Thread(target=self._run_timer, name='zoo-view-counter-flush', daemon=True).start()
+
+    def _run_timer(self):
+        while True:
+            time.sleep(_flush_interval())
+            with self._lock:
+                due = bool(self._pending) and self._flush_due()
+            if due:
+                self.flush_logged()
+                # Connections are per thread; do not keep this one open between flushes.
+                connections.close_all()
+
+    def flush_logged(self):
+        try:
+            self.flush()
+        except Exception:
+            # Counts were put back; the next flush retries them.
+            logger.exception('Could not flush view counts')
+
+    def pending(self):
+        with self._lock:
+            return dict(self._pending)
+
+    def _take(self, animal_ids=None):
+        with self._lock:
+            local = self._pending
+            self._pending = defaultdict(int)
+            self._last_flush = time.monotonic()
+        cache = _shared_cache()
+        if cache is None:
+            return dict(local)
+        ids = set(local) | set(animal_ids or ())
+        counts = {}
+        keys = {f'{CACHE_KEY_PREFIX}{pk}': pk for pk in ids}
+        for key, value in cache.get_many(list(keys)).items():
+            if value:
+                # Decrement rather than delete so increments made by other
+                # workers between get_many() and here are not lost.
+                cache.decr(key, value)
+                counts[keys[key]] = value
+        return counts
+
+    def _restore(self, counts):
+        cache = _shared_cache()
+        with self._lock:
+            for pk, amount in counts.items():
+                if cache is not None:
+                    key = f'{CACHE_KEY_PREFIX}{pk}'
+                    if not cache.add(key, amount, timeout=None):
+                        cache.incr(key, amount)
+                    self._pending.setdefault(pk, 0)
+                else:
+                    self._pending[pk] += amount
+
+    def flush(self, animal_ids=None):
+        """Write buffered counts to the database; return the number of views written."""
+        from .models import Animal
+        from .trending import add_views
+
+        counts = self._take(animal_ids)
+        if not counts:
+            return 0
+        by_amount = defaultdict(list)
+        for pk, amount in counts.items():
+            by_amount[amount].append(pk)
+        try:
+            with transaction.atomic():
+                for amount, pks in by_amount.items():
+                    Animal.objects.filter(pk__in=pks).update(view_count=F('view_count') + amount)
+                # Views are bucketed by flush time, at most one flush interval late.
+                add_views(counts)
+        except Exception:
+            self._restore(counts)
+            raise
+        return sum(counts.values())
+
+
+view_counter = ViewCounterBuffer()
+
+
+def record_view(animal_id):
+    view_counter.increment(animal_id)
+
+
+async def arecord_view(animal_id):
+    """record_view() for async code: only the flush (or a shared cache) needs a thread."""
+    if _shared_cache() is not None:
+        await sync_to_async(record_view)(animal_id)
+    elif view_counter.add(animal_id):
+        await sync_to_async(view_counter.flush_logged)()
+
+
+def flush_view_counts(animal_ids=None):
+    return view_counter.flush(animal_ids)
+
+
+@atexit.register
+def _flush_on_shutdown():
+    # Graceful worker shutdown (SIGTERM -> sys.exit) runs atexit handlers;
+    # make sure buffered views reach the database before the process exits.
+    try:
+        view_counter.flush()
+    except Exception:
+        logger.exception('Could not flush view counts at shutdown; %d animal(s) lost', len(view_counter.pending()))
@@ -0,0 +1,168 @@
+"""Materialized dashboard data.
+
+The dashboard renders from a single DashboardSnapshot row instead of
+aggregating on every request. The row is fully rebuilt by the
+refreshdashboard command (or inline once it is older than
+ZOO_DASHBOARD_MAX_AGE seconds), and individual sections are refreshed
+from the signal handlers in zoo.signals when the underlying models change.
+
+Items are stored as nested dicts shaped like the model instances the
+dashboard template used to receive (``animal.image.url``,
+``blog.author.username``), so the template reads them unchanged.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import favorites
+from .models import Animal, Blog, Category, DashboardSnapshot, Feedback
+
+SNAPSHOT_PK = 1
+RECENT_LIMIT = 5
+DATE_FIELDS = ('created_at', 'date_posted')
+
+
+def _max_age():
+    return getattr(settings, 'ZOO_DASHBOARD_MAX_AGE', 5 * 60)
+
+
+def _image(animal):
+    return {'url': animal.image.url} if animal.image else None
+
+
+def _animal(animal):
+    return {
+        'pk': animal.pk,
+        'name': animal.name,
+        'species': animal.species,
+        'image': _image(animal),
+        'created_at': animal.created_at,
+        'view_count': animal.view_count,
+        'favorite_count': animal.favorite_count,
+    }
+
+
+def _category_counts():
+    # A correlated count per category reads the (category, created_at) index
+    # and keeps categories in primary-key order; a JOIN + GROUP BY over every
+    # category column would be re-sorted in a temp B-tree.
+    counts = (
+        Animal.objects.filter(category=OuterRef('pk'))
+        .order_by().values('category').annotate(n=Count('pk')).values('n')
+    )
+    rows = (
+        Category.objects.annotate(animal_count=Coalesce(Subquery(counts), Value(0)))
+        .order_by('pk').values_list('name', 'animal_count')
+    )
+    return [list(row) for row in rows]
+
+
+ANIMAL_FIELDS = ('name', 'species', 'image', 'created_at', 'view_count', 'favorite_count')
+
+
+def _recent_animals():
+    return [_animal(a) for a in Animal.objects.only(*ANIMAL_FIELDS).order_by('-created_at', '-id')[:RECENT_LIMIT]]
+
+
+def _most_viewed_animals():
+    return [_animal(a) for a in Animal.objects.only(*ANIMAL_FIELDS).order_by('-view_count', '-id')[:RECENT_LIMIT]]
+
+
+def _most_loved_animals():
+    return [_animal(a) for a in favorites.most_loved(RECENT_LIMIT).only(*ANIMAL_FIELDS)]
+
+
+def _recent_blogs():
+    rows = Blog.objects.order_by('-date_posted', '-id').values_list('pk', 'title', 'author__username', 'date_posted')
+    return [
+        {
+            'pk': pk,
+            'title': title,
+            'author': {'username': username} if username else None,
+            'date_posted': date_posted,
+        }
+        for pk, title, username, date_posted in rows[:RECENT_LIMIT]
+    ]
+
+
+def _recent_feedback():
+    rows = Feedback.objects.order_by('-created_at', '-id').values_list('user__username', 'message', 'created_at')
+    return [
+        {
+            'user': {'username': username} if username else None,
+            'message': message,
+            'created_at': created_at,
+        }
+        for username, message, created_at in rows[:RECENT_LIMIT]
+    ]
+
+
+SECTIONS = {
+    'category_counts': _category_counts,
+    'recent_animals': _recent_animals,
+    'most_viewed_animals': _most_viewed_animals,
+    'most_loved_animals': _most_loved_animals,
+    'recent_blogs': _recent_blogs,
+    'recent_feedback': _recent_feedback,
+}
+
+# Sections affected by a change to each model.
+MODEL_SECTIONS = {
+    Animal: ('category_counts', 'recent_animals', 'most_viewed_animals', 'most_loved_animals'),
+    Category: ('category_counts',),
+    Blog: ('recent_blogs',),
+    Feedback: ('recent_feedback',),
+}
+
+
+def refresh(sections=None):
+    """Recompute ``sections`` (all by default) and store them in the snapshot row."""
+    full = sections is None
+    names = list(SECTIONS) if full else list(sections)
+    values = {name: SECTIONS[name]() for name in names}
+    with transaction.atomic():
+        snapshot = DashboardSnapshot.objects.select_for_update().filter(pk=SNAPSHOT_PK).first()
+        if snapshot is None:
+            if not full:
+                # Nothing materialized yet; build everything at once.
+                values = {name: build() for name, build in SECTIONS.items()}
+            snapshot = DashboardSnapshot(pk=SNAPSHOT_PK, data=values, refreshed_at=timezone.now())
+        else:
+            snapshot.data.update(values)
+            if full:
+                snapshot.refreshed_at = timezone.now()
+        snapshot.save()
+    return snapshot
+
+
+def refresh_for_model(model):
+    sections = MODEL_SECTIONS.get(model)
+    if sections:
+        transaction.on_commit(lambda: refresh(sections))
+
+
+def _revive_dates(items):
+    for item in items:
+        for field in DATE_FIELDS:
+            if isinstance(item.get(field), str):
+                item[field] = parse_datetime(item[field])
+    return items
+
+
+def get_snapshot():
+    """Return the dashboard data dict, rebuilding it if missing or stale."""
+    snapshot = DashboardSnapshot.objects.filter(pk=SNAPSHOT_PK).first()
+    if snapshot is None or snapshot.refreshed_at < timezone.now() - timedelta(seconds=_max_age()):
+        snapshot = refresh()
+        # Round-trip through JSON so fresh and stored snapshots look the same.
+        snapshot.refresh_from_db()
+    data = dict(snapshot.data)
+    for name in ('recent_animals', 'most_viewed_animals', 'most_loved_animals', 'recent_blogs', 'recent_feedback'):
+        data[name] = _revive_dates(data.get(name, []))
+    data['refreshed_at'] = snapshot.refreshed_at
+    return data
@@ -0,0 +1,148 @@
+"""SQLite production profile.
+
+``configure_connection`` runs on every new connection (see zoo.signals) and
+applies ZOO_SQLITE_PRAGMAS: WAL so readers never block the writer,
+synchronous=NORMAL (durable in WAL mode, without an fsync per commit),
+a busy timeout instead of immediate "database is locked" errors, and a
+larger page cache and memory map. With CONN_MAX_AGE these are paid once
+per worker connection rather than once per request.
+
+When ZOO_SQLITE_REPLICA names a file, a ``replica`` database alias is
+configured for it and ``ReplicaRouter`` sends reads of read-mostly content
+models (ZOO_SQLITE_REPLICA_MODELS) there. The file is a consistent
+snapshot of the primary taken with SQLite's online backup API by the
+refreshreplica command. Requests that write, and the same browser for
+ZOO_SQLITE_REPLICA_PIN seconds afterwards, read from the primary so
+users see their own changes despite replica lag.
+"""
+import os
+import sqlite3
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+REPLICA = 'replica'
+PIN_COOKIE = 'zoo_primary'
+
+_wrote = ContextVar('zoo_db_wrote', default=False)
+_pinned = ContextVar('zoo_db_pinned', default=False)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def configure_connection(sender, connection, **kwargs):
+    """connection_created receiver applying the configured PRAGMAs."""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = dict(_setting('ZOO_SQLITE_PRAGMAS', {}))
+    if connection.alias == REPLICA:
+        # The replica file is replaced wholesale by refreshreplica; never write to it.
+        pragmas.pop('journal_mode', None)
+        pragmas['query_only'] = 'ON'
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def replica_enabled():
+    return REPLICA in settings.DATABASES
+
+
+class ReplicaRouter:
+    """Route reads of read-mostly models to the replica when it is safe to."""
+
+    def _replica_models(self):
+        return {label.lower() for label in _setting('ZOO_SQLITE_REPLICA_MODELS', ())}
+
+    def db_for_read(self, model, **hints):
+        if not replica_enabled() or _wrote.get() or _pinned.get():
+            return None
+        if connections['default'].in_atomic_block:
+            # Read-modify-write inside a transaction must see the primary.
+            return None
+        if model._meta.label_lower in self._replica_models():
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA:
+            return False
+        return None
+
+
+class ReplicaPinningMiddleware:
+    """Read from the primary for a while after a browser's request wrote something."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        wrote_token = _wrote.set(False)
+        pinned_token = _pinned.set(bool(request.COOKIES.get(PIN_COOKIE)))
+        try:
+            return self.pin(self.get_response(request))
+        finally:
+            _wrote.reset(wrote_token)
+            _pinned.reset(pinned_token)
+
+    async def __acall__(self, request):
+        # sync_to_async copies context changes back, so writes made by
+        # views in worker threads are seen here.
+        wrote_token = _wrote.set(False)
+        pinned_token = _pinned.set(bool(request.COOKIES.get(PIN_COOKIE)))
+        try:
+            return self.pin(await self.get_response(request))
+        finally:
+            _wrote.reset(wrote_token)
+            _pinned.reset(pinned_token)
+
+    def pin(self, response):
+        if replica_enabled() and _wrote.get():
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=_setting('ZOO_SQLITE_REPLICA_PIN', 5 * 60),
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+
+def refresh_replica(source=None, target=None, pages=1024):
+    """Copy the primary database to the replica file with the online backup API.
+
+    The copy is written next to the target and moved into place atomically,
+    so readers see either the old snapshot or the new one. Returns the
+    target path.
+    """
+    source = source or settings.DATABASES['default']['NAME']
+    target = target or settings.DATABASES[REPLICA]['NAME']
+    tmp = f'{target}.tmp'
+    src = sqlite3.connect(source)
+    dst = sqlite3.connect(tmp)
+    try:
+        # Copies in steps of `pages`, so writers are only briefly blocked.
+        src.backup(dst, pages=pages)
+        dst.execute('PRAGMA journal_mode = DELETE')
+    finally:
+        dst.close()
+        src.close()
+    os.replace(tmp, target)
+    return target
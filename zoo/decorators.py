@@ -2,6 +2,8 @@ from functools import wraps
 from django.shortcuts import redirect
 from django.core.exceptions import PermissionDenied
 
+from .roles import NO_ROLE, get_role
+
 
 def role_required(allowed_roles=None):
     if allowed_roles is None:
@@ -13,11 +15,11 @@ def role_required(allowed_roles=None):
             user = request.user
             if not user.is_authenticated:
                 return redirect('login')
-            # if profile missing, deny
-            profile = getattr(user, 'profile', None)
-            if profile is None:
+            # Cached per user (see zoo.roles); a missing profile means no role, so deny.
+            role = get_role(request)
+            if role == NO_ROLE:
                 raise PermissionDenied
-            if profile.role not in allowed_roles:
+            if role not in allowed_roles:
                 raise PermissionDenied
             return view_func(request, *args, **kwargs)
 
@@ -0,0 +1,117 @@
+"""Streaming CSV/JSONL exports.
+
+Rows are read with ``values_list(...).iterator(chunk_size=...)`` and
+encoded one at a time, so memory use does not grow with the size of the
+export. The same generators back the admin export views and the
+exportdata management command.
+
+Exported text is user-submitted (contact messages, feedback), and
+spreadsheet programs run CSV cells that start with ``=``, ``+``, ``-`` or
+``@`` as formulas. iter_csv() prefixes such cells with an apostrophe so
+they open as text; JSONL output is left as is.
+"""
+import csv
+import datetime
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Animal, ContactMessage, Feedback
+
+CHUNK_SIZE = 2000
+# Leading characters that make a spreadsheet treat a cell as a formula.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+EXPORTS = {
+    'contact': (ContactMessage, ['id', 'created_at', 'name', 'email', 'subject', 'urgency', 'message']),
+    'feedback': (Feedback, ['id', 'created_at', 'user__username', 'rating', 'message']),
+    'animals': (Animal, ['id', 'created_at', 'name', 'species', 'scientific_name', 'category__name', 'zone__name', 'view_count']),
+}
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def build_queryset(kind, since=None, until=None, min_rating=None, max_rating=None):
+    """Filtered, projected queryset for an export. Dates are inclusive ``YYYY-MM-DD`` strings."""
+    model, fields = EXPORTS[kind]
+    qs = model.objects.order_by('pk')
+    # Compare against day boundaries rather than created_at__date so the
+    # filter can use an index on created_at.
+    if since:
+        qs = qs.filter(created_at__gte=_day_start(_as_date(since)))
+    if until:
+        qs = qs.filter(created_at__lt=_day_start(_as_date(until) + datetime.timedelta(days=1)))
+    if model is Feedback:
+        if min_rating is not None:
+            qs = qs.filter(rating__gte=min_rating)
+        if max_rating is not None:
+            qs = qs.filter(rating__lte=max_rating)
+    return qs.values_list(*fields), [field.replace('__', '_') for field in fields]
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def _as_date(value):
+    if isinstance(value, datetime.date):
+        return value
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(f'Invalid date: {value!r} (expected YYYY-MM-DD)')
+    return parsed
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def iter_csv(rows, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+def iter_jsonl(rows, fields):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+
+FORMATS = {
+    'csv': (iter_csv, 'text/csv'),
+    'jsonl': (iter_jsonl, 'application/x-ndjson'),
+}
+
+
+def iter_gzip(chunks, flush_every=64 * 1024):
+    """Gzip an iterable of str on the fly, yielding compressed bytes."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    pending = 0
+    for chunk in chunks:
+        data = chunk.encode('utf-8')
+        pending += len(data)
+        out = compressor.compress(data)
+        if pending >= flush_every:
+            out += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def iter_export(kind, fmt='csv', gzip=False, **filters):
+    rows, fields = build_queryset(kind, **filters)
+    encode, _ = FORMATS[fmt]
+    chunks = encode(rows, fields)
+    if gzip:
+        return iter_gzip(chunks)
+    return (chunk.encode('utf-8') for chunk in chunks)
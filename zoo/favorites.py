@@ -0,0 +1,105 @@
+"""Per-user favorite sets and denormalized favorite counts.
+
+Each user's favorite animal ids are read as one set, so any page can
+mark favorites with a single lookup instead of a query per animal. The
+set is cached only in the cache named by ZOO_FAVORITES_CACHE, which must
+be shared by all workers: the Favorite receivers can only drop an entry
+from a cache every worker reads. Without one it is queried once per
+request.
+
+``Animal.favorite_count`` is kept in step by the Favorite post_save and
+post_delete receivers in zoo.signals (so admin deletes and cascades count
+too), inside the same transaction as the insert/delete. "Most loved"
+rankings read that indexed column instead of grouping over Favorite.
+Writes that bypass signals (bulk loads, raw SQL) are reconciled with
+``recount()``, also available as the recountfavorites command.
+"""
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .caching import shared_cache
+from .models import Animal, Favorite
+
+CACHE_KEY_PREFIX = 'zoo:favorites:'
+
+
+def _timeout():
+    return getattr(settings, 'ZOO_FAVORITES_CACHE_TIMEOUT', 60 * 60)
+
+
+def _cache():
+    return shared_cache(getattr(settings, 'ZOO_FAVORITES_CACHE', None))
+
+
+def _key(user_id):
+    return f'{CACHE_KEY_PREFIX}{user_id}'
+
+
+def _load(user_id):
+    cache = _cache()
+    ids = cache.get(_key(user_id)) if cache is not None else None
+    if ids is None:
+        ids = frozenset(Favorite.objects.filter(user_id=user_id).values_list('animal_id', flat=True))
+        if cache is not None:
+            cache.set(_key(user_id), ids, _timeout())
+    return ids
+
+
+def favorite_ids(user):
+    """Frozen set of animal ids ``user`` has favorited (empty for anonymous users)."""
+    if not user.is_authenticated:
+        return frozenset()
+    # request.user is loaded per request, so this memoizes for one request.
+    if not hasattr(user, '_zoo_favorite_ids'):
+        user._zoo_favorite_ids = _load(user.pk)
+    return user._zoo_favorite_ids
+
+
+def invalidate(user_id):
+    cache = _cache()
+    if cache is not None:
+        cache.delete(_key(user_id))
+
+
+def adjust_count(animal_id, delta):
+    """Move ``animal_id``'s favorite_count by ``delta``, never below zero."""
+    animals = Animal.objects.filter(pk=animal_id)
+    if delta < 0:
+        animals = animals.filter(favorite_count__gte=-delta)
+    animals.update(favorite_count=F('favorite_count') + delta)
+
+
+def toggle(user, animal_id):
+    """Add or remove a favorite; returns True if the animal is now a favorite."""
+    if hasattr(user, '_zoo_favorite_ids'):
+        del user._zoo_favorite_ids
+    with transaction.atomic():
+        deleted, _ = Favorite.objects.filter(user_id=user.pk, animal_id=animal_id).delete()
+        if deleted:
+            return False
+        try:
+            with transaction.atomic():
+                Favorite.objects.create(user_id=user.pk, animal_id=animal_id)
+        except IntegrityError:
+            # A concurrent request already added it.
+            pass
+    # favorite_count and the cached set are maintained by the Favorite receivers in zoo.signals.
+    return True
+
+
+def most_loved(limit=10):
+    return Animal.objects.filter(favorite_count__gt=0).order_by('-favorite_count', '-id')[:limit]
+
+
+def recount(animal_ids=None):
+    """Recompute favorite_count from the Favorite table; returns rows updated."""
+    counts = (
+        Favorite.objects.filter(animal_id=OuterRef('pk'))
+        .order_by().values('animal_id').annotate(n=Count('pk')).values('n')
+    )
+    qs = Animal.objects.all()
+    if animal_ids is not None:
+        qs = qs.filter(pk__in=animal_ids)
+    return qs.update(favorite_count=Coalesce(Subquery(counts), Value(0)))
@@ -0,0 +1,128 @@
+"""Responsive derivatives for Animal.image.
+
+Each uploaded image gets fixed-width WebP and JPEG variants stored next to
+it under ``animals/derivatives/``. Generation runs on a small background
+thread pool after the saving transaction commits (see zoo.signals), and
+the buildimagederivatives command backfills existing images in parallel.
+
+Once every variant is written, the image name is recorded in
+Animal.derivatives_of, so pages decide whether to emit a srcset from the
+row they already loaded instead of asking the storage for each file.
+"""
+import hashlib
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_DIR = 'animals/derivatives'
+VARIANTS = {'thumb': 160, 'card': 400, 'hero': 1200}
+FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}
+QUALITY = 82
+
+_executor = None
+
+
+def derivative_name(name, variant, fmt):
+    # Images in different directories may share a file name; the digest of
+    # the full stored name keeps their derivatives apart.
+    stem = os.path.splitext(os.path.basename(name))[0]
+    digest = hashlib.md5(name.encode(), usedforsecurity=False).hexdigest()[:10]
+    return f'{DERIVATIVE_DIR}/{stem}-{digest}_{variant}.{fmt}'
+
+
+def derivative_names(name):
+    return [derivative_name(name, variant, fmt) for variant in VARIANTS for fmt in FORMATS]
+
+
+def has_derivatives(name):
+    """Whether every variant of ``name`` is in storage (one exists() call per file)."""
+    return all(default_storage.exists(path) for path in derivative_names(name))
+
+
+def derivatives_ready(animal):
+    """Whether ``animal``'s current image has derivatives, without touching the storage."""
+    return bool(animal.image) and animal.derivatives_of == animal.image.name
+
+
+def mark_built(name):
+    """Record that the derivatives of ``name`` exist on every animal using that image."""
+    from . import pagecache
+    from .models import Animal
+
+    # update() skips the post_save receivers, so nothing is rescheduled;
+    # bump updated_at and the page cache so pages pick up the srcset.
+    updated = (
+        Animal.objects.filter(image=name).exclude(derivatives_of=name)
+        .update(derivatives_of=name, updated_at=timezone.now())
+    )
+    if updated:
+        pagecache.bump(Animal)
+    return updated
+
+
+def generate_derivatives(name, force=False):
+    """Write every variant of the stored image ``name``; return how many were written."""
+    from PIL import Image, ImageOps
+
+    if not force and has_derivatives(name):
+        mark_built(name)
+        return 0
+    with default_storage.open(name, 'rb') as fh:
+        original = Image.open(fh)
+        original.load()
+    original = ImageOps.exif_transpose(original)
+    written = 0
+    for variant, width in VARIANTS.items():
+        image = original
+        if image.width > width:
+            height = round(image.height * width / image.width)
+            image = image.resize((width, height), Image.LANCZOS)
+        for fmt, pil_format in FORMATS.items():
+            out = image
+            if pil_format == 'JPEG' and out.mode not in ('RGB', 'L'):
+                out = out.convert('RGB')
+            buf = io.BytesIO()
+            out.save(buf, pil_format, quality=QUALITY, optimize=True)
+            path = derivative_name(name, variant, fmt)
+            if default_storage.exists(path):
+                default_storage.delete(path)
+            default_storage.save(path, ContentFile(buf.getvalue()))
+            written += 1
+    mark_built(name)
+    return written
+
+
+def _generate_quietly(name):
+    try:
+        generate_derivatives(name)
+    except Exception:
+        logger.exception('Could not generate derivatives for %s', name)
+
+
+def schedule_derivatives(name):
+    """Generate derivatives for ``name`` off the request thread."""
+    global _executor
+    if getattr(settings, 'ZOO_IMAGE_DERIVATIVES_SYNC', False):
+        _generate_quietly(name)
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'ZOO_IMAGE_DERIVATIVE_WORKERS', 2),
+            thread_name_prefix='zoo-images',
+        )
+    _executor.submit(_generate_quietly, name)
+
+
+def srcset(name, fmt):
+    return ', '.join(
+        f'{default_storage.url(derivative_name(name, variant, fmt))} {width}w'
+        for variant, width in VARIANTS.items()
+    )
@@ -0,0 +1,101 @@
+"""A small database-backed job queue.
+
+Views enqueue slow side effects (sending email, ...) as Job rows and
+return immediately; the runjobs management command claims due jobs and
+runs the matching function registered with ``@task`` in zoo.tasks.
+Failed jobs are retried with exponential backoff and end up in the
+``dead`` state after ``max_attempts`` tries.
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def task(func):
+    """Register ``func`` so it can be enqueued by name."""
+    _registry[f'{func.__module__}.{func.__name__}'] = func
+    func.task_name = f'{func.__module__}.{func.__name__}'
+    return func
+
+
+def _get_task(name):
+    if not _registry:
+        from . import tasks  # noqa: F401  (registers the built-in tasks)
+    return _registry[name]
+
+
+def enqueue(func, max_attempts=None, delay=0, **payload):
+    job = Job.objects.create(
+        task=func.task_name,
+        payload=payload,
+        max_attempts=max_attempts or getattr(settings, 'ZOO_JOB_MAX_ATTEMPTS', 5),
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+    return job
+
+
+def backoff(attempts):
+    base = getattr(settings, 'ZOO_JOB_BACKOFF_BASE', 30)
+    return timedelta(seconds=base * 2 ** (attempts - 1))
+
+
+def _claim(job_id, now):
+    # Compare-and-set so two workers never run the same job.
+    return Job.objects.filter(pk=job_id, status='pending').update(status='running', locked_at=now) == 1
+
+
+def release_stale(now=None):
+    """Put jobs left 'running' by a crashed worker back in the queue."""
+    now = now or timezone.now()
+    timeout = timedelta(seconds=getattr(settings, 'ZOO_JOB_LOCK_TIMEOUT', 10 * 60))
+    return Job.objects.filter(status='running', locked_at__lt=now - timeout).update(status='pending', locked_at=None)
+
+
+def run_job(job):
+    job.attempts += 1
+    try:
+        _get_task(job.task)(**job.payload)
+    except Exception as e:
+        job.last_error = ''.join(traceback.format_exception(e))
+        job.locked_at = None
+        if job.attempts >= job.max_attempts:
+            job.status = 'dead'
+            job.finished_at = timezone.now()
+            logger.error('Job %s failed permanently: %s', job, e)
+        else:
+            job.status = 'pending'
+            job.run_at = timezone.now() + backoff(job.attempts)
+            logger.warning('Job %s failed (attempt %s), retrying at %s', job, job.attempts, job.run_at)
+        job.save(update_fields=['attempts', 'last_error', 'locked_at', 'status', 'run_at', 'finished_at'])
+        return False
+    job.status = 'done'
+    job.locked_at = None
+    job.finished_at = timezone.now()
+    job.save(update_fields=['attempts', 'locked_at', 'status', 'finished_at'])
+    return True
+
+
+def run_pending(limit=100):
+    """Run up to ``limit`` due jobs; return (succeeded, failed) counts."""
+    now = timezone.now()
+    release_stale(now)
+    due = Job.objects.filter(status='pending', run_at__lte=now).order_by('run_at', 'pk')
+    succeeded = failed = 0
+    for job in due[:limit]:
+        if not _claim(job.pk, now):
+            continue
+        job.status = 'running'
+        if run_job(job):
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
@@ -0,0 +1,145 @@
+import asyncio
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from zoo.management.commands.benchzoo import Command as BenchZooCommand, bench_host, percentile
+
+
+def _summary(latencies, statuses, elapsed):
+    return {
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'mean': statistics.fmean(latencies) if latencies else 0.0,
+        'statuses': sorted(set(statuses)),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the WSGI and ASGI handlers on the same URLs under concurrent load, in-process: '
+        'WSGI with one thread per concurrent request, ASGI with concurrent tasks on one event loop. '
+        'Reports throughput and latency for each.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per URL and handler.')
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument(
+            '--only', default=r'^(home|animal_detail|dashboard)$',
+            help='Regex of URL names to benchmark (default: home, animal detail and dashboard).',
+        )
+        parser.add_argument('--username', help='Send requests as this user.')
+        parser.add_argument('--password', default='bench1234')
+
+    def handle(self, *args, **options):
+        targets = BenchZooCommand().build_targets(options['only'])
+        if not targets:
+            raise CommandError('No URLs to benchmark.')
+        cookie = self.login(options)
+        wsgi = WSGIHandler()
+        asgi = ASGIHandler()
+        for name, url in targets:
+            sync = self.run_wsgi(wsgi, url, cookie, options)
+            async_ = asyncio.run(self.run_asgi(asgi, url, cookie, options))
+            ratio = async_['rps'] / sync['rps'] if sync['rps'] else 0.0
+            for mode, result in (('wsgi', sync), ('asgi', async_)):
+                self.stdout.write(
+                    f'{name:<18} {mode}  {result["rps"]:7.1f} req/s  p50 {result["p50"]:7.1f}ms  '
+                    f'p95 {result["p95"]:7.1f}ms  status {",".join(str(s) for s in result["statuses"])}'
+                )
+            self.stdout.write(f'{name:<18} asgi/wsgi throughput x{ratio:.2f}')
+
+    def login(self, options):
+        if not options['username']:
+            return ''
+        client = Client(HTTP_HOST=bench_host())
+        if not client.login(username=options['username'], password=options['password']):
+            raise CommandError(f'Could not log in as {options["username"]}.')
+        return '; '.join(f'{key}={morsel.value}' for key, morsel in client.cookies.items())
+
+    def run_wsgi(self, handler, url, cookie, options):
+        path, _, query = url.partition('?')
+        host = bench_host()
+
+        def fetch(_):
+            environ = {
+                'PATH_INFO': path, 'QUERY_STRING': query, 'HTTP_HOST': host, 'SERVER_NAME': host,
+                'wsgi.input': BytesIO(), 'wsgi.errors': sys.stderr,
+            }
+            if cookie:
+                environ['HTTP_COOKIE'] = cookie
+            setup_testing_defaults(environ)
+            status = []
+            start = time.perf_counter()
+            body = handler(environ, lambda line, headers, exc_info=None: status.append(int(line[:3])))
+            try:
+                for _chunk in body:
+                    pass
+            finally:
+                body.close()
+            return (time.perf_counter() - start) * 1000, status[0]
+
+        fetch(None)  # warm up caches and connections
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            samples = list(pool.map(fetch, range(options['requests'])))
+        return _summary([s[0] for s in samples], [s[1] for s in samples], time.perf_counter() - started)
+
+    async def run_asgi(self, handler, url, cookie, options):
+        path, _, query = url.partition('?')
+        host = bench_host()
+        headers = [(b'host', host.encode())]
+        if cookie:
+            headers.append((b'cookie', cookie.encode()))
+
+        async def fetch():
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+                'root_path': '', 'headers': headers, 'client': ('127.0.0.1', 0), 'server': (host, 80),
+            }
+            body_sent = False
+            finished = asyncio.Event()
+            status = []
+
+            async def receive():
+                nonlocal body_sent
+                if not body_sent:
+                    body_sent = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                # The handler listens for a disconnect while the view runs.
+                await finished.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            start = time.perf_counter()
+            await handler(scope, receive, send)
+            finished.set()
+            return (time.perf_counter() - start) * 1000, status[0]
+
+        await fetch()  # warm up caches and connections
+        remaining = options['requests']
+        samples = []
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                samples.append(await fetch())
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(options['concurrency'])))
+        return _summary([s[0] for s in samples], [s[1] for s in samples], time.perf_counter() - started)
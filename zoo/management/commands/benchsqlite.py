@@ -0,0 +1,112 @@
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from zoo.management.commands.benchzoo import percentile
+
+# What Django's SQLite backend gives you with no extra configuration.
+DEFAULT_PRAGMAS = {'journal_mode': 'DELETE', 'synchronous': 'FULL'}
+DEFAULT_TIMEOUT = 5
+
+READ_SQL = 'SELECT id, name, species, view_count FROM zoo_animal ORDER BY created_at DESC, id DESC LIMIT 24 OFFSET ?'
+POINT_SQL = 'SELECT * FROM zoo_animal WHERE id = ?'
+WRITE_SQL = 'UPDATE zoo_animal SET view_count = view_count + 1 WHERE id = ?'
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare SQLite PRAGMA profiles under a concurrent read/write workload on a copy of the '
+        'database: Django defaults vs ZOO_SQLITE_PRAGMAS. Reports throughput, latency and lock errors.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--seconds', type=float, default=5.0)
+        parser.add_argument('--write-ratio', type=float, default=0.1, help='Fraction of operations that write.')
+        parser.add_argument('--database', default=settings.DATABASES['default']['NAME'])
+
+    def handle(self, *args, **options):
+        source = sqlite3.connect(options['database'])
+        ids = [row[0] for row in source.execute('SELECT id FROM zoo_animal')]
+        if not ids:
+            source.close()
+            self.stderr.write('No animals to benchmark against; run generatezoo first.')
+            return
+        workdir = tempfile.mkdtemp(prefix='zoo-benchsqlite-')
+        try:
+            profiles = {
+                'django-default': (DEFAULT_PRAGMAS, DEFAULT_TIMEOUT),
+                'production': (settings.ZOO_SQLITE_PRAGMAS, settings.DATABASES['default'].get('OPTIONS', {}).get('timeout', 20)),
+            }
+            for name, (pragmas, timeout) in profiles.items():
+                path = os.path.join(workdir, f'{name}.sqlite3')
+                copy = sqlite3.connect(path)
+                source.backup(copy)
+                copy.close()
+                result = self.run_profile(path, pragmas, timeout, ids, options)
+                self.stdout.write(
+                    f'{name:<15} {result["ops_per_s"]:9.1f} ops/s  '
+                    f'read p50 {result["read_p50"]:6.2f}ms p95 {result["read_p95"]:6.2f}ms  '
+                    f'write p50 {result["write_p50"]:6.2f}ms p95 {result["write_p95"]:6.2f}ms  '
+                    f'{result["errors"]} lock error(s)'
+                )
+        finally:
+            source.close()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def run_profile(self, path, pragmas, timeout, ids, options):
+        deadline = time.monotonic() + options['seconds']
+        reads, writes, errors = [], [], []
+        lock = threading.Lock()
+
+        def worker(seed):
+            rng = random.Random(seed)
+            conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+            for key, value in pragmas.items():
+                conn.execute(f'PRAGMA {key} = {value}')
+            local_reads, local_writes, local_errors = [], [], 0
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    if rng.random() < options['write_ratio']:
+                        conn.execute('BEGIN IMMEDIATE')
+                        conn.execute(WRITE_SQL, [rng.choice(ids)])
+                        conn.execute('COMMIT')
+                        local_writes.append((time.perf_counter() - start) * 1000)
+                    else:
+                        conn.execute(READ_SQL, [rng.randrange(0, max(len(ids) - 24, 1))]).fetchall()
+                        conn.execute(POINT_SQL, [rng.choice(ids)]).fetchone()
+                        local_reads.append((time.perf_counter() - start) * 1000)
+                except sqlite3.OperationalError:
+                    local_errors += 1
+                    if conn.in_transaction:
+                        conn.execute('ROLLBACK')
+            conn.close()
+            with lock:
+                reads.extend(local_reads)
+                writes.extend(local_writes)
+                errors.append(local_errors)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(options['threads'])]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        return {
+            'ops_per_s': (len(reads) + len(writes)) / elapsed if elapsed else 0.0,
+            'read_p50': statistics.median(reads) if reads else 0.0,
+            'read_p95': percentile(reads, 95),
+            'write_p50': statistics.median(writes) if writes else 0.0,
+            'write_p95': percentile(writes, 95),
+            'errors': sum(errors),
+        }
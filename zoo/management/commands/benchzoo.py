@@ -0,0 +1,232 @@
+import json
+import re
+import statistics
+import subprocess
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.http.request import validate_host
+from django.test import Client, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver
+
+# Routes that need a POST body or would change data on GET beyond what we measure.
+SKIP = {'animal_delete', 'blog_delete', 'export_data'}
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def bench_host():
+    """A Host header the project accepts, so requests are not rejected with DisallowedHost."""
+    if validate_host('localhost', settings.ALLOWED_HOSTS):
+        return 'localhost'
+    for host in settings.ALLOWED_HOSTS:
+        host = host.lstrip('.')
+        if host and host != '*':
+            return host
+    return 'localhost'
+
+
+def zoo_routes():
+    """(name, route) for every named pattern in zoo/urls.py."""
+    resolver = get_resolver()
+    for entry in resolver.url_patterns:
+        if isinstance(entry, URLResolver) and getattr(entry.urlconf_module, '__name__', '') == 'zoo.urls':
+            for pattern in entry.url_patterns:
+                if isinstance(pattern, URLPattern) and pattern.name:
+                    yield pattern.name, str(pattern.pattern)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark every URL in zoo/urls.py with the test client (or against --base-url) at a given '
+        'concurrency. Reports p50/p95/p99 latency, throughput and queries per request.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Requests per URL.')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--only', help='Regex; benchmark only URL names that match.')
+        parser.add_argument(
+            '--base-url',
+            help='Drive a running server (anonymous requests only; query counts need ZOO_PERF_SERVER_TIMING there).',
+        )
+        parser.add_argument('--username', help='Log in as this user (test client only).')
+        parser.add_argument('--password', default='bench1234')
+        parser.add_argument('--output', '-o', help='Write machine-readable results to this JSON file.')
+        parser.add_argument('--compare', help='Previous results JSON to compare against.')
+
+    def handle(self, *args, **options):
+        targets = self.build_targets(options['only'])
+        if not targets:
+            raise CommandError('No URLs to benchmark.')
+        fetch = self.make_fetch(options)
+        results = []
+        failed = []
+        # Query counts are read from Server-Timing, which is not sent to every visitor.
+        with nullcontext() if options['base_url'] else override_settings(ZOO_PERF_SERVER_TIMING=True):
+            for name, url in targets:
+                result = self.run_url(fetch, url, options)
+                result['name'] = name
+                results.append(result)
+                self.stdout.write(
+                    f'{name:<18} p50 {result["p50_ms"]:7.1f}ms  p95 {result["p95_ms"]:7.1f}ms  '
+                    f'p99 {result["p99_ms"]:7.1f}ms  {result["rps"]:7.1f} req/s  '
+                    f'{result["queries"] if result["queries"] is not None else "-":>4} queries  '
+                    f'status {",".join(str(s) for s in result["statuses"])}'
+                )
+                errors = [status for status in result['statuses'] if status >= 400]
+                if errors:
+                    # Timings of error responses say nothing about the page.
+                    failed.append(name)
+                    self.stderr.write(self.style.WARNING(
+                        f'{name}: {url} answered {", ".join(str(s) for s in errors)}'
+                    ))
+        report = {
+            'commit': self.git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'mode': 'http' if options['base_url'] else 'test-client',
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+        if options['compare']:
+            self.compare(report, options['compare'])
+        if failed:
+            raise CommandError(f'{len(failed)} URL(s) returned errors: {", ".join(failed)}')
+
+    def build_targets(self, only):
+        from zoo.models import Animal, Blog, Category
+
+        samples = {
+            'pk': Animal.objects.order_by('pk').values_list('pk', flat=True).first(),
+            'slug': Category.objects.order_by('pk').values_list('slug', flat=True).first(),
+        }
+        # animal_media needs an animal that actually has the file.
+        media = None
+        for field in ('video', 'sound'):
+            pk = Animal.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True}) \
+                .order_by('pk').values_list('pk', flat=True).first()
+            if pk is not None:
+                media = (pk, field)
+                break
+        blog_pk = Blog.objects.filter(approved=True).order_by('pk').values_list('pk', flat=True).first()
+        targets = []
+        for name, route in zoo_routes():
+            if name in SKIP or (only and not re.search(only, name)):
+                continue
+            url = '/' + route
+            if '<str:field>' in route:
+                if media is None:
+                    continue
+                url = url.replace('<int:pk>', str(media[0])).replace('<str:field>', media[1])
+            if '<int:pk>' in route:
+                pk = blog_pk if name.startswith('blog') else samples['pk']
+                if pk is None:
+                    continue
+                url = url.replace('<int:pk>', str(pk))
+            if '<str:resource>' in route:
+                url = url.replace('<str:resource>', 'animals')
+            if '<slug:slug>' in route:
+                if not samples['slug']:
+                    continue
+                url = url.replace('<slug:slug>', samples['slug'])
+            targets.append((name, url))
+        return targets
+
+    def make_fetch(self, options):
+        if options['base_url']:
+            base = options['base_url'].rstrip('/')
+
+            def fetch(url):
+                req = urllib.request.Request(base + url)
+                try:
+                    with urllib.request.urlopen(req, timeout=30) as resp:
+                        resp.read()
+                        return resp.status, resp.headers.get('Server-Timing', '')
+                except urllib.error.HTTPError as e:
+                    return e.code, e.headers.get('Server-Timing', '')
+            return fetch
+
+        # Log in once (password hashing is deliberately slow) and share the session cookie.
+        cookies = None
+        if options['username']:
+            login_client = Client(HTTP_HOST=bench_host())
+            if not login_client.login(username=options['username'], password=options['password']):
+                raise CommandError(f'Could not log in as {options["username"]}.')
+            cookies = login_client.cookies
+        local = threading.local()
+
+        def fetch(url):
+            client = getattr(local, 'client', None)
+            if client is None:
+                client = local.client = Client(raise_request_exception=False, HTTP_HOST=bench_host())
+                if cookies is not None:
+                    client.cookies = cookies.copy()
+            response = client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            return response.status_code, response.get('Server-Timing', '')
+        return fetch
+
+    def run_url(self, fetch, url, options):
+        fetch(url)  # warm up caches and connections
+
+        def timed(_):
+            start = time.perf_counter()
+            status, timing = fetch(url)
+            return time.perf_counter() - start, status, timing
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            samples = list(pool.map(timed, range(options['requests'])))
+        elapsed = time.perf_counter() - started
+        latencies = [s[0] * 1000 for s in samples]
+        queries = [int(m.group(1)) for _, _, timing in samples for m in [SERVER_TIMING_QUERIES.search(timing)] if m]
+        return {
+            'url': url,
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'mean_ms': round(statistics.fmean(latencies), 2),
+            'rps': round(len(samples) / elapsed, 1) if elapsed else 0.0,
+            'queries': round(statistics.fmean(queries), 1) if queries else None,
+            'statuses': sorted({s[1] for s in samples}),
+        }
+
+    def git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def compare(self, report, path):
+        with open(path) as fh:
+            previous = {r['name']: r for r in json.load(fh)['results']}
+        self.stdout.write(f'\nCompared with {path}:')
+        for result in report['results']:
+            before = previous.get(result['name'])
+            if not before or not before['p95_ms']:
+                continue
+            change = (result['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100
+            self.stdout.write(
+                f'{result["name"]:<18} p95 {before["p95_ms"]:7.1f} -> {result["p95_ms"]:7.1f}ms ({change:+.0f}%)  '
+                f'queries {before["queries"]} -> {result["queries"]}'
+            )
@@ -0,0 +1,56 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import F
+
+
+def _init_worker():
+    # Needed when workers are spawned rather than forked (e.g. on Windows).
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    # Each worker opens its own database connection when it first needs one.
+    connections.close_all()
+
+
+def _build(name, force):
+    from zoo.images import generate_derivatives
+    return generate_derivatives(name, force=force)
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive thumbnails for every Animal.image, in parallel.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--force', action='store_true', help='Regenerate derivatives that already exist.')
+
+    def handle(self, *args, **options):
+        from zoo.models import Animal
+
+        animals = Animal.objects.exclude(image='').exclude(image__isnull=True)
+        if not options['force']:
+            animals = animals.exclude(derivatives_of=F('image'))
+        names = list(animals.values_list('image', flat=True).distinct())
+        self.stdout.write(f'Processing {len(names)} image(s) with {options["workers"]} worker(s)...')
+        started = time.monotonic()
+        written = failed = 0
+        # Forked workers must not inherit this connection (CONN_MAX_AGE keeps
+        # it open): SQLite connections cannot be used across fork().
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as pool:
+            futures = {pool.submit(_build, name, options['force']): name for name in names}
+            for future in as_completed(futures):
+                try:
+                    written += future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stdout.write(self.style.WARNING(f'Could not process {futures[future]}: {e}'))
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {written} derivative(s) in {elapsed:.1f}s ({failed} failed).'
+        ))
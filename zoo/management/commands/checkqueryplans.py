@@ -0,0 +1,73 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+# A plan line that reads a whole table ("SCAN zoo_animal", but not
+# "SCAN zoo_animal USING INDEX ..."), or sorts rows after fetching them.
+FULL_SCAN = re.compile(r'\bSCAN (\w+)(?! USING (?:COVERING )?INDEX)\s*$')
+TEMP_SORT = re.compile(r'USE TEMP B-TREE FOR (ORDER BY|GROUP BY|DISTINCT)')
+
+
+def hot_queries():
+    """(name, queryset) for the queries that run on every list/detail page."""
+    from zoo import favorites, pagination, views
+    from zoo.models import Animal, Blog, Favorite, Feedback, Job, Quiz
+
+    now = timezone.now()
+    ordering = views.ANIMAL_ORDERING
+    return [
+        ('animal list', Animal.objects.order_by(*ordering)[:25]),
+        ('animal list page 2', Animal.objects.filter(pagination.keyset_filter(ordering, [now, 1])).order_by(*ordering)[:25]),
+        ('category animals', Animal.objects.filter(category_id=1).order_by(*ordering)[:25]),
+        ('category animals page 2', Animal.objects.filter(category_id=1).filter(
+            pagination.keyset_filter(ordering, [now, 1])).order_by(*ordering)[:25]),
+        ('most viewed animals', Animal.objects.order_by('-view_count', '-id')[:5]),
+        ('most loved animals', favorites.most_loved(5)),
+        ('animal detail', Animal.objects.filter(pk=1)),
+        ('blog list', Blog.objects.filter(approved=True).order_by('-date_posted', '-id')[:25]),
+        ('recent blogs', Blog.objects.order_by('-date_posted', '-id')[:5]),
+        ('recent feedback', Feedback.objects.order_by('-created_at', '-id')[:5]),
+        ('favorites list', Favorite.objects.filter(user_id=1).order_by('-id')[:25]),
+        ('quiz sample', Quiz.objects.filter(rand_key__gte=0.5).order_by('rand_key')[:5]),
+        ('quiz sample by difficulty', Quiz.objects.filter(difficulty='easy', rand_key__gte=0.5).order_by('rand_key')[:5]),
+        ('pending jobs', Job.objects.filter(status='pending', run_at__lte=now).order_by('run_at')[:10]),
+    ]
+
+
+def plan_problems(plan):
+    problems = []
+    for line in plan.splitlines():
+        match = FULL_SCAN.search(line)
+        if match:
+            problems.append(f'full scan of {match.group(1)}')
+        match = TEMP_SORT.search(line)
+        if match:
+            problems.append(f'temp B-tree for {match.group(1)}')
+    return problems
+
+
+class Command(BaseCommand):
+    help = (
+        'Run EXPLAIN QUERY PLAN for the hot queries and fail if any does a full table scan '
+        'or sorts with a temp B-tree. Use in CI after changing models or queries.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError(f'Plan checks are written for SQLite, not {connection.vendor}.')
+        failures = []
+        for name, queryset in hot_queries():
+            plan = queryset.explain()
+            problems = plan_problems(plan)
+            if options['verbose_plans'] or problems:
+                self.stdout.write(f'{name}:\n  ' + plan.replace('\n', '\n  '))
+            if problems:
+                failures.append(f'{name}: {", ".join(problems)}')
+        if failures:
+            raise CommandError('Query plan regressions:\n  ' + '\n  '.join(failures))
+        self.stdout.write(self.style.SUCCESS(f'All {len(hot_queries())} hot queries use indexes.'))
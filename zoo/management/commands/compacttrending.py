@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        'Fold hourly animal view buckets into daily ones and expire old daily buckets. '
+        'Run periodically (e.g. hourly from cron).'
+    )
+
+    def handle(self, *args, **options):
+        from zoo.trending import compact
+
+        compacted, expired = compact()
+        self.stdout.write(self.style.SUCCESS(
+            f'Compacted {compacted} hourly bucket(s); expired {expired} daily bucket(s).'
+        ))
@@ -0,0 +1,40 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Stream contact messages, feedback or animals to CSV/JSONL with constant memory use.'
+
+    def add_arguments(self, parser):
+        from zoo.exports import EXPORTS, FORMATS
+
+        parser.add_argument('kind', choices=sorted(EXPORTS))
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+        parser.add_argument('--output', '-o', help='File to write (default: stdout).')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--since', help='Only rows created on or after YYYY-MM-DD.')
+        parser.add_argument('--until', help='Only rows created on or before YYYY-MM-DD.')
+        parser.add_argument('--min-rating', type=int, help='Feedback only.')
+        parser.add_argument('--max-rating', type=int, help='Feedback only.')
+
+    def handle(self, *args, **options):
+        from zoo.exports import iter_export
+
+        try:
+            chunks = iter_export(
+                options['kind'], options['format'], gzip=options['gzip'],
+                since=options['since'], until=options['until'],
+                min_rating=options['min_rating'], max_rating=options['max_rating'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        out = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+        finally:
+            if options['output']:
+                out.close()
+            else:
+                out.flush()
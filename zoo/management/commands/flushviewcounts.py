@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Write buffered animal view counts to the database. Requires ZOO_VIEW_COUNTER_CACHE to name a '
+        'cache shared by all workers (Redis, Memcached, database or file based): counts buffered in a '
+        "worker's own memory are only reachable from that worker, which flushes them itself."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Animals whose counters are read from the cache at once.',
+        )
+
+    def handle(self, *args, **options):
+        from zoo.caching import shared_cache
+        from zoo.counters import flush_view_counts
+        from zoo.models import Animal
+
+        alias = getattr(settings, 'ZOO_VIEW_COUNTER_CACHE', None)
+        if shared_cache(alias) is None:
+            raise CommandError(
+                'ZOO_VIEW_COUNTER_CACHE must name a cache shared by all workers; '
+                f'{alias!r} is not one, so this process cannot see their buffered views.'
+            )
+        # This process has seen no views itself, so it cannot know which
+        # counters are set: check the counter of every animal.
+        animal_ids = list(Animal.objects.order_by('pk').values_list('pk', flat=True))
+        batch_size = options['batch_size']
+        written = 0
+        for start in range(0, len(animal_ids), batch_size):
+            written += flush_view_counts(animal_ids[start:start + batch_size])
+        self.stdout.write(self.style.SUCCESS(f'Flushed {written} buffered view(s).'))
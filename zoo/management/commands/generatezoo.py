@@ -0,0 +1,209 @@
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+WORDS = [
+    'golden', 'spotted', 'striped', 'giant', 'pygmy', 'northern', 'desert', 'river', 'snow', 'royal',
+    'crested', 'horned', 'silver', 'red', 'blue', 'woolly', 'dwarf', 'mountain', 'marsh', 'forest',
+]
+ANIMALS = [
+    'lion', 'tiger', 'otter', 'eagle', 'gecko', 'tortoise', 'heron', 'lemur', 'bison', 'python',
+    'penguin', 'zebra', 'falcon', 'frog', 'shark', 'beetle', 'panda', 'koala', 'ibis', 'lynx',
+]
+DIETS = ['Herbivore', 'Carnivore', 'Omnivore', 'Insectivore', 'Piscivore']
+HABITATS = ['Savannah', 'Rainforest', 'Desert', 'Ocean', 'Wetlands', 'Tundra', 'Mountains']
+
+
+class Command(BaseCommand):
+    help = (
+        'Deterministically generate a synthetic zoo for load testing '
+        '(e.g. --animals 100000 --favorites 1000000). Data is appended to the current database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--zones', type=int, default=10)
+        parser.add_argument('--animals', type=int, default=1000)
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--favorites', type=int, default=5000)
+        parser.add_argument('--blogs', type=int, default=200)
+        parser.add_argument('--feedback', type=int, default=1000)
+        parser.add_argument('--quizzes', type=int, default=100)
+        parser.add_argument('--facts', type=int, default=50)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--no-search', action='store_true', help='Skip rebuilding the search index.')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.prefix = f'gen{options["seed"]}'
+        started = time.monotonic()
+
+        categories = self.stage('categories', options['categories'], self.make_categories)
+        zones = self.stage('zones', options['zones'], self.make_zones)
+        animal_ids = self.stage('animals', options['animals'], lambda n: self.make_animals(n, categories, zones))
+        user_ids = self.stage('users', options['users'], self.make_users)
+        self.stage('favorites', options['favorites'], lambda n: self.make_favorites(n, user_ids, animal_ids))
+        self.stage('blogs', options['blogs'], lambda n: self.make_blogs(n, user_ids))
+        self.stage('feedback', options['feedback'], lambda n: self.make_feedback(n, user_ids))
+        self.stage('quizzes', options['quizzes'], self.make_quizzes)
+        self.stage('facts', options['facts'], self.make_facts)
+
+        # bulk_create bypasses the signals that maintain derived data.
+        from zoo import dashboard, favorites, pagecache, recommend, search, stats
+        favorites.recount()
+        stats.invalidate()
+        pagecache.invalidate()
+        dashboard.refresh()
+        self.stage('recommendations', None, lambda n: recommend.refresh(full=True))
+        if not options['no_search'] and search.is_available():
+            self.stage('search index', None, lambda n: search.rebuild())
+        self.stdout.write(self.style.SUCCESS(f'Done in {time.monotonic() - started:.1f}s.'))
+
+    def stage(self, label, count, build):
+        if count == 0:
+            return []
+        start = time.monotonic()
+        result = build(count)
+        elapsed = time.monotonic() - start
+        size = count if count is not None else result
+        self.stdout.write(f'  {label:<13} {size:>10,} in {elapsed:6.2f}s')
+        return result
+
+    def bulk(self, model, objs):
+        with transaction.atomic():
+            model.objects.bulk_create(objs, batch_size=self.batch_size, ignore_conflicts=True)
+
+    def chunks(self, total):
+        for start in range(0, total, self.batch_size):
+            yield range(start, min(start + self.batch_size, total))
+
+    def name(self, i):
+        return f'{self.rng.choice(WORDS).title()} {self.rng.choice(ANIMALS).title()} {i}'
+
+    def make_categories(self, n):
+        from zoo.models import Category
+        self.bulk(Category, [
+            Category(name=f'Category {self.prefix}-{i}', slug=f'category-{self.prefix}-{i}', description='Generated category')
+            for i in range(n)
+        ])
+        return list(Category.objects.filter(slug__startswith=f'category-{self.prefix}-').values_list('pk', flat=True))
+
+    def make_zones(self, n):
+        from zoo.models import Zone
+        names = [f'Zone {self.prefix}-{i}' for i in range(n)]
+        self.bulk(Zone, [Zone(name=name, description='Generated zone') for name in names])
+        return list(Zone.objects.filter(name__in=names).values_list('pk', flat=True))
+
+    def make_animals(self, n, categories, zones):
+        from zoo.models import Animal
+        for chunk in self.chunks(n):
+            self.bulk(Animal, [
+                Animal(
+                    name=self.name(i),
+                    species=self.rng.choice(ANIMALS),
+                    scientific_name=f'{self.rng.choice(ANIMALS).title()} {self.rng.choice(WORDS)}',
+                    category_id=self.rng.choice(categories) if categories else None,
+                    zone_id=self.rng.choice(zones) if zones else None,
+                    description=' '.join(self.rng.choices(WORDS + ANIMALS, k=30)),
+                    diet=self.rng.choice(DIETS),
+                    habitat=self.rng.choice(HABITATS),
+                    view_count=self.rng.randint(0, 5000),
+                    catalog_id=f'{self.prefix}-{i}',
+                )
+                for i in chunk
+            ])
+        return list(Animal.objects.filter(catalog_id__startswith=f'{self.prefix}-').values_list('pk', flat=True))
+
+    def make_users(self, n):
+        from django.contrib.auth.models import User
+        from zoo.models import Profile
+        password = make_password('bench1234')
+        usernames = [f'{self.prefix}-user{i}' for i in range(n)]
+        for chunk in self.chunks(n):
+            self.bulk(User, [User(username=usernames[i], password=password) for i in chunk])
+        ids = list(User.objects.filter(username__startswith=f'{self.prefix}-user').values_list('pk', flat=True))
+        roles = ['visitor'] * 6 + ['educator', 'zookeeper', 'admin']
+        for start in range(0, len(ids), self.batch_size):
+            self.bulk(Profile, [
+                Profile(user_id=pk, role=self.rng.choice(roles), age=self.rng.randint(6, 80))
+                for pk in ids[start:start + self.batch_size]
+            ])
+        return ids
+
+    def make_favorites(self, n, user_ids, animal_ids):
+        from zoo.models import Favorite
+        if not user_ids or not animal_ids:
+            return 0
+        per_user, extra = divmod(n, len(user_ids))
+        per_user = min(per_user + (1 if extra else 0), len(animal_ids))
+        batch = []
+        made = 0
+        for user_id in user_ids:
+            if made >= n:
+                break
+            k = min(per_user, n - made)
+            for animal_id in self.rng.sample(animal_ids, k):
+                batch.append(Favorite(user_id=user_id, animal_id=animal_id))
+            made += k
+            if len(batch) >= self.batch_size:
+                self.bulk(Favorite, batch)
+                batch = []
+        if batch:
+            self.bulk(Favorite, batch)
+        return made
+
+    def make_blogs(self, n, user_ids):
+        from zoo.models import Blog
+        for chunk in self.chunks(n):
+            blogs = [
+                Blog(
+                    title=f'Notes on the {self.name(i)}',
+                    content='\n\n'.join(' '.join(self.rng.choices(WORDS + ANIMALS, k=80)) for _ in range(4)),
+                    author_id=self.rng.choice(user_ids) if user_ids else None,
+                    approved=self.rng.random() < 0.8,
+                )
+                for i in chunk
+            ]
+            # bulk_create skips Blog.save(), which renders the Markdown.
+            for blog in blogs:
+                blog.render_content()
+            self.bulk(Blog, blogs)
+
+    def make_feedback(self, n, user_ids):
+        from zoo.models import Feedback
+        for chunk in self.chunks(n):
+            self.bulk(Feedback, [
+                Feedback(
+                    user_id=self.rng.choice(user_ids) if user_ids and self.rng.random() < 0.9 else None,
+                    message=' '.join(self.rng.choices(WORDS + ANIMALS, k=20)),
+                    rating=self.rng.randint(1, 5),
+                )
+                for _ in chunk
+            ])
+
+    def make_quizzes(self, n):
+        from zoo.models import Quiz
+        objs = []
+        for i in range(n):
+            options = self.rng.sample(ANIMALS, 4)
+            objs.append(Quiz(
+                question=f'Which of these is a {self.rng.choice(WORDS)} animal? (#{i})',
+                options='\n'.join(options),
+                options_list=options,
+                correct_answer=self.rng.choice(options),
+                difficulty=self.rng.choice(['easy', 'medium', 'hard']),
+                rand_key=self.rng.random(),
+            ))
+        self.bulk(Quiz, objs)
+
+    def make_facts(self, n):
+        from zoo.models import Fact
+        self.bulk(Fact, [
+            Fact(title=f'Fact about the {self.name(i)}', content=' '.join(self.rng.choices(WORDS + ANIMALS, k=25)))
+            for i in range(n)
+        ])
@@ -0,0 +1,230 @@
+import csv
+import json
+import os
+import shutil
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+ANIMAL_FIELDS = ['name', 'species', 'scientific_name', 'description', 'diet', 'habitat', 'fun_facts']
+IMAGE_DIR = 'animals/images'
+
+
+def read_rows(path):
+    """Yield dicts from a .csv or .jsonl catalog file."""
+    if path.endswith('.jsonl') or path.endswith('.ndjson'):
+        with open(path, encoding='utf-8') as fh:
+            for line in fh:
+                line = line.strip()
+                if line:
+                    # CSV values are strings; JSON numbers (e.g. "id": 17) end up in
+                    # CharFields too, so convert them the same way.
+                    yield {
+                        key: value if value is None or isinstance(value, str) else str(value)
+                        for key, value in json.loads(line).items()
+                    }
+    else:
+        with open(path, newline='', encoding='utf-8') as fh:
+            yield from csv.DictReader(fh)
+
+
+def batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Import a partner catalog of animals from CSV or JSONL. Rows are upserted in batches '
+        'keyed on catalog_id (falls back to the slugified name); media is copied or downloaded '
+        'with a bounded thread pool. Use --resume to continue after a failure.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Catalog file (.csv or .jsonl).')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--media-dir', help='Directory that relative image paths are resolved against.')
+        parser.add_argument('--media-workers', type=int, default=8)
+        parser.add_argument('--timeout', type=float, default=15.0, help='Per-download timeout in seconds.')
+        parser.add_argument('--resume', action='store_true', help='Skip rows committed by a previous run.')
+        parser.add_argument('--no-media', action='store_true', help='Skip fetching images.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'No such file: {path}')
+        checkpoint_path = f'{path}.progress'
+        done = 0
+        if options['resume'] and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as fh:
+                done = int(fh.read().strip() or 0)
+            self.stdout.write(f'Resuming after row {done}.')
+
+        self.timings = {'parse': 0.0, 'taxonomy': 0.0, 'animals': 0.0, 'media': 0.0}
+        self.media_count = 0
+        started = time.monotonic()
+        processed = 0
+        rows = read_rows(path)
+        t = time.monotonic()
+        for index, batch in enumerate(batched(rows, options['batch_size'])):
+            self.timings['parse'] += time.monotonic() - t
+            batch_start = index * options['batch_size']
+            if batch_start + len(batch) <= done:
+                t = time.monotonic()
+                continue
+            if batch_start < done:
+                batch = batch[done - batch_start:]
+            self.import_batch(batch, options)
+            processed += len(batch)
+            done += len(batch)
+            with open(checkpoint_path, 'w') as fh:
+                fh.write(str(done))
+            self.stdout.write(f'  {done} row(s) committed')
+            t = time.monotonic()
+
+        self.finish()
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        self.report(processed, time.monotonic() - started)
+
+    def import_batch(self, batch, options):
+        from zoo.models import Animal
+
+        t = time.monotonic()
+        categories, zones = self.upsert_taxonomy(batch)
+        self.timings['taxonomy'] += time.monotonic() - t
+
+        t = time.monotonic()
+        animals = {}
+        images = {}
+        # Upserted rows must get a new updated_at too: it feeds the detail page ETag.
+        now = timezone.now()
+        for row in batch:
+            catalog_id = (row.get('catalog_id') or row.get('id') or slugify(row.get('name', ''))).strip()
+            if not catalog_id or not row.get('name'):
+                continue
+            animals[catalog_id] = Animal(
+                catalog_id=catalog_id,
+                category=categories.get(row.get('category') or ''),
+                zone=zones.get(row.get('zone') or ''),
+                updated_at=now,
+                **{field: (row.get(field) or '') for field in ANIMAL_FIELDS},
+            )
+            if row.get('image'):
+                images[catalog_id] = row['image']
+        with transaction.atomic():
+            Animal.objects.bulk_create(
+                list(animals.values()),
+                update_conflicts=True,
+                unique_fields=['catalog_id'],
+                update_fields=ANIMAL_FIELDS + ['category', 'zone', 'updated_at'],
+                batch_size=options['batch_size'],
+            )
+        self.timings['animals'] += time.monotonic() - t
+
+        if images and not options['no_media']:
+            t = time.monotonic()
+            self.fetch_media(images, options)
+            self.timings['media'] += time.monotonic() - t
+
+    def upsert_taxonomy(self, batch):
+        from zoo.models import Category, Zone
+
+        category_names = {row['category'] for row in batch if row.get('category')}
+        zone_names = {row['zone'] for row in batch if row.get('zone')}
+        with transaction.atomic():
+            if category_names:
+                by_slug = {slugify(name): name for name in category_names}
+                Category.objects.bulk_create(
+                    [Category(name=name, slug=slug) for slug, name in by_slug.items()],
+                    update_conflicts=True,
+                    unique_fields=['slug'],
+                    update_fields=['name'],
+                )
+            # Zone names carry no unique constraint, so match existing rows by name
+            # and only insert the missing ones.
+            existing = set(Zone.objects.filter(name__in=zone_names).values_list('name', flat=True))
+            Zone.objects.bulk_create([Zone(name=name) for name in zone_names - existing])
+        by_slug = {}
+        for name in category_names:
+            by_slug.setdefault(slugify(name), []).append(name)
+        categories = {
+            name: category
+            for category in Category.objects.filter(slug__in=by_slug)
+            for name in by_slug[category.slug]
+        }
+        zones = {z.name: z for z in Zone.objects.filter(name__in=zone_names)}
+        return categories, zones
+
+    def fetch_media(self, images, options):
+        from zoo.models import Animal
+
+        dest_dir = os.path.join(settings.MEDIA_ROOT, IMAGE_DIR)
+        os.makedirs(dest_dir, exist_ok=True)
+
+        def fetch(item):
+            catalog_id, source = item
+            ext = os.path.splitext(source.split('?', 1)[0])[1].lower() or '.jpg'
+            name = f'{IMAGE_DIR}/{slugify(catalog_id)}{ext}'
+            dest = os.path.join(settings.MEDIA_ROOT, name)
+            if os.path.exists(dest):
+                return catalog_id, name
+            try:
+                if source.startswith(('http://', 'https://')):
+                    with urllib.request.urlopen(source, timeout=options['timeout']) as resp, open(dest, 'wb') as out:
+                        shutil.copyfileobj(resp, out)
+                else:
+                    src = source if os.path.isabs(source) else os.path.join(options['media_dir'] or '', source)
+                    shutil.copyfile(src, dest)
+            except Exception as e:
+                if os.path.exists(dest):
+                    os.remove(dest)
+                self.stdout.write(self.style.WARNING(f'Could not fetch image {source}: {e}'))
+                return catalog_id, None
+            return catalog_id, name
+
+        with ThreadPoolExecutor(max_workers=options['media_workers']) as pool:
+            fetched = dict(pool.map(fetch, images.items()))
+        fetched = {catalog_id: name for catalog_id, name in fetched.items() if name}
+        to_update = []
+        now = timezone.now()
+        for animal in Animal.objects.filter(catalog_id__in=fetched).only('pk', 'catalog_id', 'image'):
+            if animal.image.name != fetched[animal.catalog_id]:
+                animal.image = fetched[animal.catalog_id]
+                # bulk_update() does not run auto_now.
+                animal.updated_at = now
+                to_update.append(animal)
+        Animal.objects.bulk_update(to_update, ['image', 'updated_at'])
+        self.media_count += len(fetched)
+
+    def finish(self):
+        # Bulk writes bypass model signals; bring the derived data back in line.
+        from zoo import dashboard, pagecache, search, stats
+
+        stats.invalidate()
+        pagecache.invalidate()
+        dashboard.refresh()
+        if search.is_available():
+            t = time.monotonic()
+            search.rebuild()
+            self.timings['search index'] = time.monotonic() - t
+
+    def report(self, rows, elapsed):
+        self.stdout.write(self.style.SUCCESS(f'Imported {rows} row(s) in {elapsed:.1f}s.'))
+        for stage, seconds in self.timings.items():
+            rate = f'{rows / seconds:,.0f} rows/s' if seconds and rows else '-'
+            self.stdout.write(f'  {stage:<13} {seconds:8.2f}s  {rate}')
+        if self.media_count:
+            self.stdout.write(f'  {self.media_count} image(s) stored; run buildimagederivatives to create thumbnails.')
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for animals, approved blogs and facts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        from zoo import search
+
+        if not search.is_available():
+            raise CommandError('Full-text search requires the SQLite backend with FTS5.')
+        written = search.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {written} document(s).'))
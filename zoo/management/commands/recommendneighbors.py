@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the "visitors who liked this also liked" lists whose favorites changed '
+        '(or all of them with --full). Run periodically (e.g. every few minutes from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute every animal, not just stale ones.')
+        parser.add_argument('--batch-size', type=int, help='Animals per co-occurrence query.')
+
+    def handle(self, *args, **options):
+        from zoo.recommend import refresh
+
+        started = time.monotonic()
+        changed = refresh(full=options['full'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{changed} neighbor list(s) updated in {time.monotonic() - started:.1f}s.'
+        ))
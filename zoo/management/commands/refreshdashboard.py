@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized dashboard snapshot. Run periodically (e.g. from cron).'
+
+    def handle(self, *args, **options):
+        from zoo.dashboard import refresh
+
+        snapshot = refresh()
+        self.stdout.write(self.style.SUCCESS(f'Dashboard snapshot refreshed at {snapshot.refreshed_at:%Y-%m-%d %H:%M:%S}.'))
@@ -0,0 +1,28 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Snapshot the primary SQLite database into the read replica file (ZOO_SQLITE_REPLICA) '
+        'using the online backup API. Run more often than ZOO_SQLITE_REPLICA_PIN (e.g. every minute).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=1024, help='Pages copied per backup step.')
+
+    def handle(self, *args, **options):
+        from zoo import db, pagecache
+
+        if not db.replica_enabled():
+            raise CommandError('No replica configured; set ZOO_SQLITE_REPLICA in settings.')
+        started = time.monotonic()
+        target = db.refresh_replica(pages=options['pages'])
+        # Pages rendered from the previous snapshot are now out of date.
+        pagecache.invalidate()
+        self.stdout.write(self.style.SUCCESS(
+            f'Replica {target} refreshed from {settings.DATABASES["default"]["NAME"]} '
+            f'in {time.monotonic() - started:.2f}s.'
+        ))
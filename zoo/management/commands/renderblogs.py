@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        'Render blog Markdown into the stored content_html, excerpt and reading_time. '
+        'Run after changing the rendering rules in zoo.markup.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing', action='store_true', help='Only posts that were never rendered.')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        from zoo import pagecache
+        from zoo.models import Blog
+
+        fields = [*Blog.RENDERED_FIELDS, 'updated_at']
+        queryset = Blog.objects.order_by('pk').only('content', *fields)
+        if options['missing']:
+            queryset = queryset.filter(content_html='')
+        now = timezone.now()
+        last_pk = 0
+        seen = changed = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:options['batch_size']])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            seen += len(batch)
+            updated = []
+            for blog in batch:
+                before = [getattr(blog, name) for name in Blog.RENDERED_FIELDS]
+                blog.render_content()
+                if [getattr(blog, name) for name in Blog.RENDERED_FIELDS] != before:
+                    # New HTML must not be answered with 304 from the old ETag.
+                    blog.updated_at = now
+                    updated.append(blog)
+            Blog.objects.bulk_update(updated, fields)
+            changed += len(updated)
+        if changed:
+            # bulk_update bypasses the signals that retire cached pages.
+            pagecache.bump(Blog)
+        self.stdout.write(self.style.SUCCESS(f'Rendered {changed} of {seen} blog post(s).'))
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Process queued background jobs (email and other slow side effects).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process due jobs once and exit.')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to sleep when the queue is empty.')
+        parser.add_argument('--limit', type=int, default=100, help='Maximum jobs per batch.')
+
+    def handle(self, *args, **options):
+        from zoo.jobs import run_pending
+
+        while True:
+            succeeded, failed = run_pending(limit=options['limit'])
+            if succeeded or failed:
+                self.stdout.write(f'Ran {succeeded + failed} job(s): {succeeded} succeeded, {failed} failed.')
+            if options['once']:
+                break
+            if not (succeeded or failed):
+                time.sleep(options['interval'])
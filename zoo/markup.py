@@ -0,0 +1,74 @@
+"""Markdown rendering for blog posts.
+
+Blog content is written in Markdown and rendered once, when the post is
+saved (Blog.save), into ``content_html`` plus a plain-text ``excerpt``
+and an estimated ``reading_time``. Pages then print the stored HTML
+instead of converting the Markdown on every request, and lists only load
+the short excerpt. Migration 0015 rendered the posts saved before these
+fields existed; the renderblogs command re-renders them after a change to
+the rendering rules.
+
+Markdown passes raw HTML through, so the output is sanitized with nh3
+against an allowlist of tags, attributes and URL schemes before it is
+stored; only that stored HTML is ever marked safe in templates.
+"""
+import html
+import math
+
+import markdown
+import nh3
+from django.conf import settings
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+EXTENSIONS = ['extra', 'sane_lists']
+ALLOWED_TAGS = {
+    'a', 'abbr', 'blockquote', 'br', 'code', 'dd', 'del', 'dl', 'dt', 'em', 'h1', 'h2', 'h3', 'h4', 'h5',
+    'h6', 'hr', 'img', 'li', 'ol', 'p', 'pre', 'strong', 'sub', 'sup', 'table', 'tbody', 'td', 'th',
+    'thead', 'tr', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title'},
+    'abbr': {'title'},
+    'img': {'src', 'alt', 'title'},
+    'td': {'align'},
+    'th': {'align'},
+}
+URL_SCHEMES = {'http', 'https', 'mailto'}
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def render_markdown(text):
+    """Sanitized HTML for Markdown ``text``."""
+    raw = markdown.markdown(text or '', extensions=EXTENSIONS, output_format='html')
+    return nh3.clean(
+        raw,
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        url_schemes=URL_SCHEMES,
+        link_rel='noopener noreferrer nofollow',
+    )
+
+
+def plain_text(content_html):
+    return ' '.join(html.unescape(strip_tags(content_html)).split())
+
+
+def excerpt(text, words=None):
+    return Truncator(text).words(words or _setting('ZOO_BLOG_EXCERPT_WORDS', 30), truncate='…')
+
+
+def reading_time(text):
+    """Estimated minutes to read ``text`` (at least one)."""
+    words = len(text.split())
+    return max(1, math.ceil(words / _setting('ZOO_BLOG_WORDS_PER_MINUTE', 200)))
+
+
+def render_content(content):
+    """The stored rendering of blog ``content``: {content_html, excerpt, reading_time}."""
+    content_html = render_markdown(content)
+    text = plain_text(content_html)
+    return {'content_html': content_html, 'excerpt': excerpt(text), 'reading_time': reading_time(text)}
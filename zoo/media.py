@@ -0,0 +1,188 @@
+"""Serving uploaded audio/video with HTTP range support.
+
+Browsers seek in <video>/<audio> elements with Range requests, and media
+is otherwise only served by django.conf.urls.static in DEBUG (which has no
+range support). ``serve()`` answers single and multiple byte ranges
+(206, multipart/byteranges for the latter), 416 for unsatisfiable ranges,
+If-Range, and the usual ETag/Last-Modified revalidation, streaming the
+file in chunks rather than reading it into memory.
+
+In production the web server should do the byte shuffling: set
+ZOO_MEDIA_ACCEL to 'nginx' (X-Accel-Redirect) or 'apache' (X-Sendfile)
+and Django only authorizes the request and points the server at the file.
+"""
+import mimetypes
+import os
+import re
+import secrets
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^\s*(\d*)\s*-\s*(\d*)\s*$')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def parse_range(header, size):
+    """Parse a Range header into sorted, merged ``(start, end)`` pairs (inclusive).
+
+    Returns None when the header should be ignored (missing, malformed, not
+    bytes, or too many ranges) and [] when no range is satisfiable.
+    """
+    if not header or '=' not in header:
+        return None
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes':
+        return None
+    parts = spec.split(',')
+    if len(parts) > _setting('ZOO_MEDIA_MAX_RANGES', 16):
+        return None
+    ranges = []
+    for part in parts:
+        match = RANGE_RE.match(part)
+        if not match:
+            return None
+        first, last = match.groups()
+        if not first and not last:
+            return None
+        if not first:
+            # Suffix range: the last N bytes.
+            length = int(last)
+            if length == 0:
+                continue
+            start, end = max(size - length, 0), size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            if last and int(last) < start:
+                return None
+            if start >= size:
+                continue
+        ranges.append((start, end))
+    ranges.sort()
+    merged = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _read(path, start, end):
+    with open(path, 'rb') as fh:
+        fh.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = fh.read(min(CHUNK_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+def _multipart(path, ranges, size, content_type, boundary):
+    for start, end in ranges:
+        yield (
+            f'\r\n--{boundary}\r\nContent-Type: {content_type}\r\n'
+            f'Content-Range: bytes {start}-{end}/{size}\r\n\r\n'
+        ).encode('ascii')
+        yield from _read(path, start, end)
+    yield f'\r\n--{boundary}--\r\n'.encode('ascii')
+
+
+def _multipart_length(ranges, size, content_type, boundary):
+    length = len(f'\r\n--{boundary}--\r\n')
+    for start, end in ranges:
+        length += len(
+            f'\r\n--{boundary}\r\nContent-Type: {content_type}\r\n'
+            f'Content-Range: bytes {start}-{end}/{size}\r\n\r\n'
+        )
+        length += end - start + 1
+    return length
+
+
+def _if_range_matches(request, etag, last_modified):
+    value = request.META.get('HTTP_IF_RANGE')
+    if not value:
+        return True
+    if value.startswith(('"', 'W/')):
+        return value == etag
+    parsed = parse_http_date_safe(value)
+    return parsed is not None and int(last_modified.timestamp()) <= parsed
+
+
+def _accelerated(name, content_type):
+    mode = _setting('ZOO_MEDIA_ACCEL', None)
+    if mode == 'nginx':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = _setting('ZOO_MEDIA_ACCEL_PREFIX', '/protected-media/') + name
+        return response
+    if mode == 'apache':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = os.path.join(settings.MEDIA_ROOT, name)
+        return response
+    return None
+
+
+def serve(request, name, storage=None):
+    """Response for the stored file ``name``, honouring Range and conditional headers."""
+    storage = storage or default_storage
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        # Remote storage: let it serve the file (and ranges) itself.
+        return HttpResponseRedirect(storage.url(name))
+
+    response = _accelerated(name, content_type)
+    if response is None:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            raise Http404('Media file not found.')
+        size = stat.st_size
+        last_modified = datetime.fromtimestamp(stat.st_mtime, tz=dt_timezone.utc)
+        etag = quote_etag(f'{int(stat.st_mtime):x}-{size:x}')
+        response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+        if response is None:
+            response = _ranged(request, path, size, content_type, etag, last_modified)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Accept-Ranges'] = 'bytes'
+    patch_cache_control(response, public=True, max_age=_setting('ZOO_MEDIA_MAX_AGE', 24 * 60 * 60))
+    return response
+
+
+def _ranged(request, path, size, content_type, etag, last_modified):
+    ranges = None
+    if request.method in ('GET', 'HEAD') and _if_range_matches(request, etag, last_modified):
+        ranges = parse_range(request.META.get('HTTP_RANGE'), size)
+    if ranges is None:
+        return FileResponse(open(path, 'rb'), content_type=content_type)
+    if not ranges:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        response = StreamingHttpResponse(_read(path, start, end), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+        return response
+    boundary = secrets.token_hex(16)
+    response = StreamingHttpResponse(
+        _multipart(path, ranges, size, content_type, boundary),
+        status=206,
+        content_type=f'multipart/byteranges; boundary={boundary}',
+    )
+    response['Content-Length'] = str(_multipart_length(ranges, size, content_type, boundary))
+    return response
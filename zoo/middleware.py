@@ -1,15 +1,229 @@
-from django.utils.deprecation import MiddlewareMixin
-from zoo.models import Animal
-
-class AnimalViewCounterMiddleware(MiddlewareMixin):
-    def process_view(self, request, view_func, view_args, view_kwargs):
-        if view_func.__name__ == 'animal_detail':
-            animal_id = view_kwargs.get('pk')
-            if animal_id:
-                try:
-                    animal = Animal.objects.get(pk=animal_id)
-                    animal.view_count = getattr(animal, 'view_count', 0) + 1
-                    animal.save(update_fields=['view_count'])
-                except Animal.DoesNotExist:
-                    pass
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import Template as DjangoTemplate
+from django.utils.functional import SimpleLazyObject
+from zoo.counters import arecord_view, record_view
+from zoo.roles import get_role
+
+perf_logger = logging.getLogger('zoo.performance')
+
+
+class HybridMiddleware:
+    """Base for middleware that runs natively under both WSGI and ASGI.
+
+    Subclasses implement ``__call__`` for the sync stack and ``__acall__``
+    for the async one, so Django never has to wrap the rest of the chain
+    in a thread to adapt it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+
+class AnimalViewCounterMiddleware(HybridMiddleware):
+    def _animal_id(self, request, response):
+        match = getattr(request, 'resolver_match', None)
+        # Counted after the view so 404s for unknown ids are not buffered.
+        if match is not None and match.url_name == 'animal_detail' and response.status_code < 400:
+            return match.kwargs.get('pk')
         return None
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        animal_id = self._animal_id(request, response)
+        if animal_id:
+            # Buffered; written back in batches by zoo.counters.
+            record_view(animal_id)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        animal_id = self._animal_id(request, response)
+        if animal_id:
+            await arecord_view(animal_id)
+        return response
+
+
+class RoleMiddleware(HybridMiddleware):
+    """Expose the user's role as a lazy ``request.zoo_role`` (see zoo.roles).
+
+    The lookup may hit the database, so async code should read it through
+    ``sync_to_async`` (templates are rendered in a thread anyway).
+    """
+
+    def __call__(self, request):
+        request.zoo_role = SimpleLazyObject(lambda: get_role(request))
+        # Under ASGI this returns the downstream coroutine for Django to await.
+        return self.get_response(request)
+
+
+class RequestMetrics:
+    """Per-request counters filled in by PerformanceMiddleware."""
+
+    def __init__(self):
+        self.db_time = 0.0
+        self.query_count = 0
+        self.template_time = 0.0
+        self.query_counts = Counter()
+        self.slow_queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.db_time += elapsed
+            self.query_count += 1
+            self.query_counts[sql] += 1
+            if elapsed * 1000 >= _setting('SLOW_QUERY_MS'):
+                self.slow_queries.append((elapsed, sql))
+
+
+_current_metrics = ContextVar('zoo_request_metrics', default=None)
+_PERF_DEFAULTS = {
+    'ENABLED': True,
+    'SLOW_REQUEST_MS': 500,
+    'SLOW_QUERY_MS': 100,
+    'N_PLUS_ONE_THRESHOLD': 5,
+    # None: send Server-Timing only in DEBUG or to staff users.
+    'SERVER_TIMING': None,
+}
+
+
+def _setting(name):
+    return getattr(settings, f'ZOO_PERF_{name}', _PERF_DEFAULTS[name])
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def instrument_connection(sender=None, connection=None, **kwargs):
+    """Time every query on ``connection`` for whichever request is current.
+
+    Async views run their queries in worker threads, each with its own
+    connection, so the wrapper stays installed for the life of the
+    connection and finds the request's metrics through a ContextVar
+    (which sync_to_async carries into the thread).
+    """
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _instrument_template_rendering():
+    # Django only emits template_rendered under the test runner, so time
+    # the backend Template.render() used by render()/render_to_string().
+    if getattr(DjangoTemplate.render, '_zoo_timed', False):
+        return
+    original = DjangoTemplate.render
+
+    @wraps(original)
+    def render(self, context=None, request=None):
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return original(self, context, request)
+        start = time.perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - start
+
+    render._zoo_timed = True
+    DjangoTemplate.render = render
+
+
+class PerformanceMiddleware(HybridMiddleware):
+    """Record wall, DB and template time per request.
+
+    Logs slow requests, slow SQL statements and statements repeated often
+    enough to suggest an N+1 query. The timings and query count also go in
+    a Server-Timing header, but only for staff or in DEBUG unless
+    ZOO_PERF_SERVER_TIMING says otherwise: they describe the backend to
+    anyone who can read the response.
+    """
+
+    def __init__(self, get_response):
+        if not _setting('ENABLED'):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        _instrument_template_rendering()
+        connection_created.connect(instrument_connection, dispatch_uid='zoo-performance-queries')
+        for connection in connections.all(initialized_only=True):
+            instrument_connection(connection=connection)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        send_timing = _setting('SERVER_TIMING')
+        if send_timing is None:
+            user = getattr(request, 'user', None)
+            send_timing = settings.DEBUG or (user is not None and user.is_staff)
+        return self.finish(request, response, metrics, start, send_timing)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        send_timing = _setting('SERVER_TIMING')
+        if send_timing is None:
+            send_timing = settings.DEBUG or (hasattr(request, 'auser') and (await request.auser()).is_staff)
+        return self.finish(request, response, metrics, start, send_timing)
+
+    def finish(self, request, response, metrics, start, send_timing):
+        total = time.perf_counter() - start
+        if send_timing:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.query_count} queries"',
+                f'tpl;dur={metrics.template_time * 1000:.1f}',
+                f'total;dur={total * 1000:.1f}',
+            ])
+        self.report(request, metrics, total)
+        return response
+
+    def report(self, request, metrics, total):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else request.path
+        if total * 1000 >= _setting('SLOW_REQUEST_MS'):
+            perf_logger.warning(
+                'Slow request %s %s (%s): %.0fms total, %.0fms db in %d queries, %.0fms templates',
+                request.method, request.path, view, total * 1000,
+                metrics.db_time * 1000, metrics.query_count, metrics.template_time * 1000,
+            )
+        for elapsed, sql in metrics.slow_queries:
+            perf_logger.warning('Slow query in %s: %.0fms %s', view, elapsed * 1000, sql)
+        threshold = _setting('N_PLUS_ONE_THRESHOLD')
+        for sql, count in metrics.query_counts.items():
+            if count >= threshold:
+                perf_logger.warning('Possible N+1 in %s: query ran %d times: %s', view, count, sql)
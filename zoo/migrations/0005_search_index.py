@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from zoo import search
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    querysets = search.indexed_querysets(
+        apps.get_model('zoo', 'Animal'),
+        apps.get_model('zoo', 'Blog'),
+        apps.get_model('zoo', 'Fact'),
+    )
+    search.rebuild(querysets=querysets)
+
+
+def drop_search_index(apps, schema_editor):
+    from zoo import search
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        search.drop_table(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zoo', '0004_contactmessage'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
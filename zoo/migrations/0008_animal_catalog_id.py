@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zoo', '0007_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='animal',
+            name='catalog_id',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+    ]
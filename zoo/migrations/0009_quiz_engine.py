@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:05
+
+import django.db.models.deletion
+import zoo.models
+from django.db import migrations, models
+
+
+def backfill_quizzes(apps, schema_editor):
+    # AddField evaluates a callable default once, so give every existing row
+    # its own random key and a parsed copy of its options.
+    Quiz = apps.get_model('zoo', 'Quiz')
+    batch = []
+    for quiz in Quiz.objects.only('pk', 'options').iterator(chunk_size=1000):
+        quiz.options_list = zoo.models.parse_quiz_options(quiz.options)
+        quiz.rand_key = zoo.models.random_key()
+        batch.append(quiz)
+        if len(batch) >= 1000:
+            Quiz.objects.bulk_update(batch, ['options_list', 'rand_key'])
+            batch = []
+    if batch:
+        Quiz.objects.bulk_update(batch, ['options_list', 'rand_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zoo', '0008_animal_catalog_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='quizzes', to='zoo.category'),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='difficulty',
+            field=models.CharField(choices=[('easy', 'Easy'), ('medium', 'Medium'), ('hard', 'Hard')], default='medium', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='options_list',
+            field=models.JSONField(default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='rand_key',
+            field=models.FloatField(db_index=True, default=zoo.models.random_key, editable=False),
+        ),
+        migrations.RunPython(backfill_quizzes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:07
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_favorite_counts(apps, schema_editor):
+    Animal = apps.get_model('zoo', 'Animal')
+    Favorite = apps.get_model('zoo', 'Favorite')
+    counts = (
+        Favorite.objects.filter(animal_id=OuterRef('pk'))
+        .order_by().values('animal_id').annotate(n=Count('pk')).values('n')
+    )
+    Animal.objects.update(favorite_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zoo', '0009_quiz_engine'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='animal',
+            name='favorite_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(backfill_favorite_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zoo', '0010_animal_favorite_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnimalViewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], default='hour', max_length=4)),
+                ('start', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('animal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_buckets', to='zoo.animal')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('resolution', 'start', 'animal'), name='zoo_viewbucket_unique')],
+            },
+        ),
+    ]
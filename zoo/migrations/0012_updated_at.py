@@ -0,0 +1,31 @@
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+
+def backfill_updated_at(apps, schema_editor):
+    apps.get_model('zoo', 'Animal').objects.update(updated_at=F('created_at'))
+    apps.get_model('zoo', 'Blog').objects.update(updated_at=F('date_posted'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zoo', '0011_animal_view_buckets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='animal',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
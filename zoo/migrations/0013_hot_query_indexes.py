@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zoo', '0012_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='animal',
+            index=models.Index(fields=['-created_at', '-id'], name='zoo_animal_created'),
+        ),
+        migrations.AddIndex(
+            model_name='animal',
+            index=models.Index(fields=['category', '-created_at', '-id'], name='zoo_animal_category_created'),
+        ),
+        migrations.AddIndex(
+            model_name='animal',
+            index=models.Index(fields=['-view_count', '-id'], name='zoo_animal_views'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['-date_posted', '-id'], name='zoo_blog_posted'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['created_at'], name='zoo_contact_created'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['-created_at', '-id'], name='zoo_feedback_created'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['difficulty', 'rand_key'], name='zoo_quiz_difficulty_rand'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:26
+
+from django.db import migrations, models
+
+
+def render_existing_posts(apps, schema_editor):
+    from zoo.markup import render_content
+
+    Blog = apps.get_model('zoo', 'Blog')
+    fields = ['content_html', 'excerpt', 'reading_time']
+    last_pk = 0
+    while True:
+        batch = list(Blog.objects.filter(pk__gt=last_pk).order_by('pk').only('content')[:500])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        for blog in batch:
+            for name, value in render_content(blog.content).items():
+                setattr(blog, name, value)
+        Blog.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zoo', '0014_animal_neighbors'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Minutes'),
+        ),
+        migrations.RunPython(render_existing_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zoo', '0015_blog_rendered_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='animal',
+            name='derivatives_of',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+    ]
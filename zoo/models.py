@@ -1,7 +1,13 @@
+import json
+import random
 
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils.text import slugify
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .markup import render_content
 
 class ContactMessage(models.Model):
     name = models.CharField(max_length=60)
@@ -11,6 +17,11 @@ class ContactMessage(models.Model):
     message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='zoo_contact_created'),
+        ]
+
     def __str__(self):
         return f"{self.subject} from {self.name} ({self.email})"
 
@@ -66,8 +77,24 @@ class Animal(models.Model):
     image = models.ImageField(upload_to='animals/images/', blank=True, null=True)
     sound = models.FileField(upload_to='animals/sounds/', blank=True, null=True)
     video = models.FileField(upload_to='animals/videos/', blank=True, null=True)
+    # Name of the image whose responsive derivatives exist (set by zoo.images);
+    # a new upload shows the plain image until its own are built.
+    derivatives_of = models.CharField(max_length=100, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     view_count = models.PositiveIntegerField(default=0)
+    # Maintained by the Favorite receivers in zoo.signals; see the recountfavorites command for repairs.
+    favorite_count = models.PositiveIntegerField(default=0, db_index=True)
+    # Stable key from an imported partner catalog (see the importcatalog command).
+    catalog_id = models.CharField(max_length=100, unique=True, null=True, blank=True)
+
+    class Meta:
+        # Match the orderings used by list pages, the dashboard and keyset pagination.
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='zoo_animal_created'),
+            models.Index(fields=['category', '-created_at', '-id'], name='zoo_animal_category_created'),
+            models.Index(fields=['-view_count', '-id'], name='zoo_animal_views'),
+        ]
 
     def __str__(self):
         return self.name
@@ -86,7 +113,32 @@ class Blog(models.Model):
     content = models.TextField()
     author = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     date_posted = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     approved = models.BooleanField(default=False)
+    # Rendered from the Markdown content on save (see zoo.markup).
+    content_html = models.TextField(blank=True, editable=False)
+    excerpt = models.TextField(blank=True, editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False, help_text='Minutes')
+
+    RENDERED_FIELDS = ('content_html', 'excerpt', 'reading_time')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-date_posted', '-id'], name='zoo_blog_posted'),
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.render_content()
+        elif 'content' in update_fields:
+            self.render_content()
+            kwargs['update_fields'] = {*update_fields, *self.RENDERED_FIELDS}
+        super().save(*args, **kwargs)
+
+    def render_content(self):
+        for name, value in render_content(self.content).items():
+            setattr(self, name, value)
 
     def __str__(self):
         return self.title
@@ -98,6 +150,11 @@ class Feedback(models.Model):
     rating = models.PositiveSmallIntegerField(default=5)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='zoo_feedback_created'),
+        ]
+
     def __str__(self):
         return f"Feedback by {self.user or 'Anonymous'}"
 
@@ -113,10 +170,121 @@ class Favorite(models.Model):
         return f"{self.user.username} likes {self.animal.name}"
 
 
+class AnimalViewBucket(models.Model):
+    """Animal detail views rolled up per hour, or per day once compacted (see zoo.trending)."""
+    RESOLUTION_CHOICES = [
+        ('hour', 'Hour'),
+        ('day', 'Day'),
+    ]
+    animal = models.ForeignKey(Animal, on_delete=models.CASCADE, related_name='view_buckets')
+    resolution = models.CharField(max_length=4, choices=RESOLUTION_CHOICES, default='hour')
+    start = models.DateTimeField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['resolution', 'start', 'animal'], name='zoo_viewbucket_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.animal_id} @ {self.start:%Y-%m-%d %H:00} ({self.resolution}): {self.count}"
+
+
+class AnimalNeighbors(models.Model):
+    """Precomputed "also liked" animals for one animal (see zoo.recommend)."""
+    animal = models.OneToOneField(Animal, on_delete=models.CASCADE, primary_key=True, related_name='neighbors')
+    # Most similar first; scores[i] is the cosine similarity of neighbor_ids[i].
+    neighbor_ids = models.JSONField(default=list)
+    scores = models.JSONField(default=list)
+    # Set when a favorite change may have changed the list; cleared by recommend.refresh().
+    stale_since = models.DateTimeField(null=True, blank=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'animal neighbors'
+
+    def __str__(self):
+        return f"{self.animal_id}: {self.neighbor_ids}"
+
+
+def random_key():
+    return random.random()
+
+
+def parse_quiz_options(raw):
+    """Options may be stored as a JSON list or one per line."""
+    raw = (raw or '').strip()
+    if raw.startswith('['):
+        try:
+            parsed = json.loads(raw)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, list):
+            return [str(option).strip() for option in parsed if str(option).strip()]
+    return [line.strip() for line in raw.splitlines() if line.strip()]
+
+
 class Quiz(models.Model):
+    DIFFICULTY_CHOICES = [
+        ('easy', 'Easy'),
+        ('medium', 'Medium'),
+        ('hard', 'Hard'),
+    ]
     question = models.CharField(max_length=400)
     options = models.TextField(help_text='Store options as JSON list or newline-separated')
     correct_answer = models.CharField(max_length=200)
+    # Parsed copy of `options`, filled in on save.
+    options_list = models.JSONField(default=list, editable=False)
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='quizzes')
+    difficulty = models.CharField(max_length=10, choices=DIFFICULTY_CHOICES, default='medium')
+    # Uniform random key used to sample questions without ORDER BY RANDOM().
+    rand_key = models.FloatField(default=random_key, editable=False, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['difficulty', 'rand_key'], name='zoo_quiz_difficulty_rand'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.options_list = parse_quiz_options(self.options)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.question
+
+
+class DashboardSnapshot(models.Model):
+    """Precomputed dashboard data, kept in a single row (see zoo.dashboard)."""
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    refreshed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Dashboard snapshot ({self.refreshed_at:%Y-%m-%d %H:%M})"
+
+
+class Job(models.Model):
+    """A unit of deferred work processed by the runjobs command (see zoo.jobs)."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('dead', 'Dead'),
+    ]
+    task = models.CharField(max_length=120)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='zoo_job_status_run_at'),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
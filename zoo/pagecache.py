@@ -0,0 +1,161 @@
+"""Full-page cache for anonymous visitors.
+
+Pages are cached under a key that includes a generation number for every
+model the page depends on. Saving or deleting one of those models bumps its
+generation (see the receivers in zoo.signals), which retires every cached
+page built from it without having to know which keys exist; stale entries
+simply age out. Pages are keyed on their path and only the query
+parameters the view reads, so made-up parameters cannot fill the cache
+with copies of the same page. Logged-in users, non-GET requests and requests with pending
+flash messages always bypass the cache.
+
+On a miss only one process renders a page at a time: the others serve the
+last good copy of the page if there is one, or wait briefly for the render
+to finish before rendering it themselves.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, QueryDict
+
+CACHE_KEY_PREFIX = 'zoo:page:'
+GENERATION_KEY_PREFIX = 'zoo:gen:'
+
+
+def tracked_models():
+    from .models import Animal, Blog, Category, Fact, Feedback, Quiz, Zone
+    return (Animal, Blog, Category, Fact, Feedback, Quiz, Zone)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _generation_key(model):
+    return f'{GENERATION_KEY_PREFIX}{model._meta.label_lower}'
+
+
+def _new_generation():
+    # Counters only go up by one per bump, so a (re)started counter must not
+    # start from a value an evicted one may have held: pages cached under
+    # that old version would come back.
+    return time.time_ns()
+
+
+def generations(models):
+    keys = [_generation_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            generation = _new_generation()
+            found[key] = generation if cache.add(key, generation, None) else cache.get(key, generation)
+    return [found[key] for key in keys]
+
+
+def bump(model):
+    key = _generation_key(model)
+    if not cache.add(key, _new_generation(), None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr(); any new value retires old pages.
+            cache.set(key, _new_generation(), None)
+
+
+def invalidate():
+    """Retire every cached page, e.g. after bulk writes that bypass signals."""
+    for model in tracked_models():
+        bump(model)
+
+
+def has_pending_messages(request):
+    return bool(request.COOKIES.get('messages')) or '_messages' in request.session
+
+
+def _cacheable(request):
+    if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+        return False
+    # Flash messages are rendered into the page; never cache or hide them.
+    return not has_pending_messages(request)
+
+
+def _page_query(request, params):
+    """The request's values for ``params`` only, in a stable order."""
+    query = QueryDict(mutable=True)
+    for param in sorted(params):
+        if param in request.GET:
+            query.setlist(param, request.GET.getlist(param))
+    return query
+
+
+def _page_keys(name, models, request):
+    path = hashlib.md5(f'{request.path}?{request.GET.urlencode()}'.encode('utf-8')).hexdigest()
+    version = '.'.join(str(g) for g in generations(models))
+    return (
+        f'{CACHE_KEY_PREFIX}{name}:{version}:{path}',
+        f'{CACHE_KEY_PREFIX}{name}:stale:{path}',
+        f'{CACHE_KEY_PREFIX}{name}:lock:{path}',
+    )
+
+
+def _response(entry, state):
+    content, content_type = entry
+    response = HttpResponse(content, content_type=content_type)
+    response['X-Page-Cache'] = state
+    return response
+
+
+def cache_anonymous_page(*models, params=()):
+    """Cache a view's response for anonymous users, versioned by ``models``' generations.
+
+    ``params`` are the query parameters the view reads; others are dropped
+    from the request before the view renders it, so the page (and links
+    built from request.GET) is the same for every request sharing its key.
+    """
+
+    def decorator(view_func):
+        name = view_func.__name__
+
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            if not _setting('ZOO_PAGE_CACHE_ENABLED', True) or not _cacheable(request):
+                return view_func(request, *args, **kwargs)
+            request.GET = _page_query(request, params)
+            key, stale_key, lock_key = _page_keys(name, models, request)
+            entry = cache.get(key)
+            if entry is not None:
+                return _response(entry, 'HIT')
+
+            lock_timeout = _setting('ZOO_PAGE_CACHE_LOCK_TIMEOUT', 10)
+            if not cache.add(lock_key, 1, lock_timeout):
+                # Someone else is rendering this page.
+                entry = cache.get(stale_key)
+                if entry is not None:
+                    return _response(entry, 'STALE')
+                deadline = time.monotonic() + _setting('ZOO_PAGE_CACHE_WAIT', 2)
+                while time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    entry = cache.get(key)
+                    if entry is not None:
+                        return _response(entry, 'HIT')
+                return view_func(request, *args, **kwargs)
+
+            try:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code == 200 and not response.streaming and not response.cookies:
+                    if hasattr(response, 'render'):
+                        response.render()
+                    entry = (response.content, response['Content-Type'])
+                    cache.set(key, entry, _setting('ZOO_PAGE_CACHE_TIMEOUT', 60))
+                    cache.set(stale_key, entry, _setting('ZOO_PAGE_CACHE_STALE_TIMEOUT', 60 * 60))
+                    response['X-Page-Cache'] = 'MISS'
+                return response
+            finally:
+                cache.delete(lock_key)
+
+        return _wrapped
+
+    return decorator
@@ -0,0 +1,146 @@
+"""Keyset (cursor) pagination for list views.
+
+Pages are addressed by the ordering values of the last/first row shown
+rather than by an OFFSET, so fetching page N costs the same as page 1 and
+rows inserted while a visitor is paging never shift items between pages.
+Every ordering must end in a unique column (normally ``-id``).
+
+Cursors come from the query string, so they are untrusted: a cursor that
+does not decode, or whose values are not valid for the ordering fields,
+is ignored and the first page is shown.
+"""
+import base64
+import json
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+# Query parameters read by paginate().
+CURSOR_PARAMS = ('after', 'before')
+
+
+def _page_size():
+    return getattr(settings, 'ZOO_PAGE_SIZE', 24)
+
+
+def encode_cursor(values):
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, ordering, model):
+    """The ordering values in ``cursor`` as Python values of ``model``'s fields, or None if invalid."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if not isinstance(values, list) or len(values) != len(ordering):
+        return None
+    try:
+        return [_to_python(model, field.lstrip('-'), value) for field, value in zip(ordering, values)]
+    except (FieldDoesNotExist, ValidationError, TypeError, ValueError, OverflowError):
+        return None
+
+
+def _to_python(model, name, value):
+    if value is None:
+        # Orderings are over non-null columns; NULL cannot be compared with < or >.
+        raise ValidationError('Missing cursor value.')
+    field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+    value = field.to_python(value)
+    # Includes the database's integer range, so out-of-range ids are rejected here.
+    field.run_validators(value)
+    return value
+
+
+def _cursor_values(obj, ordering):
+    # Rows from .values() querysets are dicts; everything else is a model instance.
+    if isinstance(obj, dict):
+        return [obj[field.lstrip('-')] for field in ordering]
+    return [getattr(obj, field.lstrip('-')) for field in ordering]
+
+
+def keyset_filter(ordering, values, forward=True):
+    """Q matching rows strictly after (or before) ``values`` in ``ordering``."""
+    condition = None
+    for i, field in enumerate(ordering):
+        name = field.lstrip('-')
+        descending = field.startswith('-')
+        lookup = 'lt' if descending == forward else 'gt'
+        clause = Q(**{f'{name}__{lookup}': values[i]})
+        for prev_field, prev_value in zip(ordering[:i], values[:i]):
+            clause &= Q(**{prev_field.lstrip('-'): prev_value})
+        condition = clause if condition is None else condition | clause
+    # Redundant bound on the leading column: lets the database seek into
+    # the ordering index instead of filtering an index scan row by row.
+    first = ordering[0]
+    lookup = 'lte' if first.startswith('-') == forward else 'gte'
+    return Q(**{f'{first.lstrip("-")}__{lookup}': values[0]}) & condition
+
+
+def _reverse(ordering):
+    return [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+
+class CursorPage:
+    def __init__(self, items, ordering, has_next, has_previous, request):
+        self.items = items
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self._request = request
+        self.next_cursor = encode_cursor(_cursor_values(items[-1], ordering)) if has_next and items else None
+        self.previous_cursor = encode_cursor(_cursor_values(items[0], ordering)) if has_previous and items else None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def _query(self, key, cursor):
+        params = self._request.GET.copy()
+        params.pop('after', None)
+        params.pop('before', None)
+        params[key] = cursor
+        return params.urlencode()
+
+    @property
+    def next_query(self):
+        return self._query('after', self.next_cursor) if self.next_cursor else None
+
+    @property
+    def previous_query(self):
+        return self._query('before', self.previous_cursor) if self.previous_cursor else None
+
+
+def paginate(request, queryset, ordering, per_page=None):
+    """Return a CursorPage for ``queryset`` using ``?after=``/``?before=`` cursors."""
+    per_page = per_page or _page_size()
+    ordering = list(ordering)
+    after = request.GET.get('after')
+    before = request.GET.get('before')
+    values = None
+    forward = True
+    if after:
+        values = decode_cursor(after, ordering, queryset.model)
+    elif before:
+        values = decode_cursor(before, ordering, queryset.model)
+        forward = values is None
+
+    if values is None:
+        items = list(queryset.order_by(*ordering)[:per_page + 1])
+        return CursorPage(items[:per_page], ordering, len(items) > per_page, False, request)
+
+    if forward:
+        qs = queryset.filter(keyset_filter(ordering, values, forward=True)).order_by(*ordering)
+        items = list(qs[:per_page + 1])
+        return CursorPage(items[:per_page], ordering, len(items) > per_page, True, request)
+
+    qs = queryset.filter(keyset_filter(ordering, values, forward=False)).order_by(*_reverse(ordering))
+    items = list(qs[:per_page + 1])
+    has_previous = len(items) > per_page
+    items = items[:per_page][::-1]
+    return CursorPage(items, ordering, True, has_previous, request)
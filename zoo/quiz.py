@@ -0,0 +1,106 @@
+"""Quiz sampling and grading.
+
+Questions are sampled with the indexed ``Quiz.rand_key`` column (seek to a
+random point, take the next N, wrap around) instead of ORDER BY RANDOM().
+The sampled ids are pinned in the session so the POST grades exactly the
+questions that were shown, and question/answer data is read from the
+cache, keyed per question, so grading does not touch the database.
+
+Saving a question only drops its cached copy in the current process, so
+entries expire after ZOO_QUIZ_CACHE_TIMEOUT seconds; that bounds how long
+other workers can show or grade against an edited question.
+"""
+import random
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Quiz
+
+SESSION_KEY = 'zoo_quiz_ids'
+CACHE_KEY_PREFIX = 'zoo:quiz:'
+
+
+def _question_count():
+    return getattr(settings, 'ZOO_QUIZ_QUESTIONS', 5)
+
+
+def _cache_timeout():
+    return getattr(settings, 'ZOO_QUIZ_CACHE_TIMEOUT', 5 * 60)
+
+
+def _filtered(category=None, difficulty=None):
+    qs = Quiz.objects.all()
+    if category:
+        qs = qs.filter(category__slug=category)
+    if difficulty:
+        qs = qs.filter(difficulty=difficulty)
+    return qs
+
+
+def sample_ids(n=None, category=None, difficulty=None):
+    n = n or _question_count()
+    qs = _filtered(category, difficulty)
+    pivot = random.random()
+    ids = list(qs.filter(rand_key__gte=pivot).order_by('rand_key').values_list('pk', flat=True)[:n])
+    if len(ids) < n:
+        ids += list(
+            qs.filter(rand_key__lt=pivot).order_by('rand_key').values_list('pk', flat=True)[:n - len(ids)]
+        )
+    random.shuffle(ids)
+    return ids
+
+
+def get_questions(ids):
+    """Question dicts (id, question, options, answer) for ``ids``, in order."""
+    keys = {f'{CACHE_KEY_PREFIX}{pk}': pk for pk in ids}
+    found = {keys[key]: value for key, value in cache.get_many(list(keys)).items()}
+    missing = [pk for pk in ids if pk not in found]
+    if missing:
+        rows = Quiz.objects.filter(pk__in=missing).values_list('pk', 'question', 'options_list', 'correct_answer')
+        fresh = {
+            pk: {'id': pk, 'question': question, 'options': options, 'answer': answer}
+            for pk, question, options, answer in rows
+        }
+        cache.set_many({f'{CACHE_KEY_PREFIX}{pk}': value for pk, value in fresh.items()}, _cache_timeout())
+        found.update(fresh)
+    return [found[pk] for pk in ids if pk in found]
+
+
+def invalidate(pk):
+    cache.delete(f'{CACHE_KEY_PREFIX}{pk}')
+
+
+def pinned_questions(session, n=None, category=None, difficulty=None, resample=False):
+    """Questions pinned in ``session``, sampling a new set if there is none."""
+    ids = None if resample else session.get(SESSION_KEY)
+    if not ids:
+        ids = sample_ids(n, category, difficulty)
+        session[SESSION_KEY] = ids
+    return get_questions(ids)
+
+
+def take_pinned(session):
+    """Unpin and return the questions shown in ``session``; None if none are pinned."""
+    ids = session.pop(SESSION_KEY, None)
+    if not ids:
+        return None
+    return get_questions(ids)
+
+
+def grade(questions, answers):
+    """Return (results, score) for a mapping of ``quiz_<id>`` form fields."""
+    results = {}
+    score = 0
+    for question in questions:
+        user_answer = answers.get(f'quiz_{question["id"]}')
+        is_correct = bool(user_answer) and user_answer.strip() == question['answer'].strip()
+        results[question['id']] = {
+            'question': question['question'],
+            'user_answer': user_answer or None,
+            'correct_answer': question['answer'],
+            'is_correct': is_correct,
+        }
+        if is_correct:
+            score += 1
+    return results, score
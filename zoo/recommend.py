@@ -0,0 +1,153 @@
+"""Visitors who liked this also liked...
+
+Item-item recommendations from the Favorite user x animal matrix. Two
+animals are similar when the same visitors favorited both; the score is
+the cosine similarity of their favorite vectors:
+
+    shared(a, b) / sqrt(fans(a) * fans(b))
+
+with fans() taken from the maintained Animal.favorite_count. The matrix
+is never built in Python: for a batch of animals SQLite computes the
+sparse co-occurrence counts with one self-join on the (user, animal)
+unique index and keeps only the best ZOO_RECOMMEND_TOP_K neighbors per
+animal with a window function. Memory is bounded by the batch size times
+K, however many favorites there are. Visitors with more than
+ZOO_RECOMMEND_MAX_USER_FAVORITES favorites are left out of the counts:
+they carry little signal and their pairs grow quadratically.
+
+Each animal's list is stored in one AnimalNeighbors row, so the detail
+page reads it with a primary-key lookup. Favorite changes mark the
+affected rows stale (see zoo.signals) and the recommendneighbors command
+recomputes just those, or everything with --full.
+"""
+import math
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Animal, AnimalNeighbors, Favorite
+
+NEIGHBORS_SQL = '''
+SELECT animal_id, neighbor_id, shared, fans FROM (
+    SELECT animal_id, neighbor_id, shared, fans,
+           ROW_NUMBER() OVER (PARTITION BY animal_id ORDER BY rank_key DESC, neighbor_id) AS position
+    FROM (
+        SELECT f1.animal_id AS animal_id, f2.animal_id AS neighbor_id, COUNT(*) AS shared,
+               a.favorite_count AS fans,
+               -- Orders neighbors like shared / sqrt(fans(a) * fans(b)) for a fixed animal a.
+               COUNT(*) * COUNT(*) * 1.0 / MAX(a.favorite_count, 1) AS rank_key
+        FROM zoo_favorite f1
+        JOIN zoo_favorite f2 ON f2.user_id = f1.user_id AND f2.animal_id != f1.animal_id
+        JOIN zoo_animal a ON a.id = f2.animal_id
+        WHERE f1.animal_id IN ({placeholders}){exclude_users}
+        GROUP BY f1.animal_id, f2.animal_id, a.favorite_count
+        HAVING COUNT(*) >= %s
+    )
+)
+WHERE position <= %s
+'''
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def heavy_users():
+    """Users with too many favorites to count in the co-occurrence matrix."""
+    limit = _setting('ZOO_RECOMMEND_MAX_USER_FAVORITES', 500)
+    return list(
+        Favorite.objects.values('user_id').annotate(n=Count('id')).filter(n__gt=limit).values_list('user_id', flat=True)
+    )
+
+
+def compute(animal_ids, exclude_users=()):
+    """{animal_id: [(neighbor_id, score), ...]} for ``animal_ids``, best first."""
+    animal_ids = list(animal_ids)
+    if not animal_ids:
+        return {}
+    fans = dict(Animal.objects.filter(pk__in=animal_ids).values_list('pk', 'favorite_count'))
+    exclude = ''
+    if exclude_users:
+        # Integers only, so they are safe to inline (and avoid the bound-parameter limit).
+        exclude = f" AND f1.user_id NOT IN ({', '.join(str(int(pk)) for pk in exclude_users)})"
+    sql = NEIGHBORS_SQL.format(placeholders=', '.join(['%s'] * len(animal_ids)), exclude_users=exclude)
+    params = [*animal_ids, _setting('ZOO_RECOMMEND_MIN_SHARED', 1), _setting('ZOO_RECOMMEND_TOP_K', 12)]
+    result = {pk: [] for pk in animal_ids}
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for animal_id, neighbor_id, shared, neighbor_fans in cursor.fetchall():
+            score = shared / math.sqrt(max(fans.get(animal_id, 0), 1) * max(neighbor_fans, 1))
+            result[animal_id].append((neighbor_id, round(min(score, 1.0), 4)))
+    return result
+
+
+def mark_stale(animal_ids):
+    """Flag the neighbor lists of ``animal_ids`` for the next refresh()."""
+    now = timezone.now()
+    AnimalNeighbors.objects.bulk_create(
+        [AnimalNeighbors(animal_id=pk, stale_since=now) for pk in set(animal_ids)],
+        update_conflicts=True,
+        unique_fields=['animal'],
+        update_fields=['stale_since'],
+    )
+
+
+def favorite_changed(user_id, animal_id):
+    """Mark the lists a favorite toggle can change: the animal's and those of the user's other favorites."""
+    others = list(Favorite.objects.filter(user_id=user_id).values_list('animal_id', flat=True))
+    if len(others) > _setting('ZOO_RECOMMEND_MAX_USER_FAVORITES', 500):
+        # Not counted as co-occurrences; only the animal's fan count moved.
+        others = []
+    mark_stale([animal_id, *others])
+
+
+def refresh(full=False, batch_size=None):
+    """Recompute stale neighbor lists (every list if ``full``); return how many changed.
+
+    A list marked stale again while it is being recomputed stays stale for
+    the next run.
+    """
+    batch_size = batch_size or _setting('ZOO_RECOMMEND_BATCH_SIZE', 200)
+    started = timezone.now()
+    if full:
+        ids = list(Animal.objects.order_by('pk').values_list('pk', flat=True))
+    else:
+        ids = list(AnimalNeighbors.objects.filter(stale_since__isnull=False).order_by('pk').values_list('pk', flat=True))
+    exclude_users = heavy_users()
+    changed = 0
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        changed += _store(compute(batch, exclude_users), started)
+    return changed
+
+
+def _store(neighbors, started):
+    current = dict(AnimalNeighbors.objects.filter(pk__in=list(neighbors)).values_list('pk', 'neighbor_ids'))
+    rows = [
+        AnimalNeighbors(animal_id=pk, neighbor_ids=[n for n, _ in ranked], scores=[s for _, s in ranked])
+        for pk, ranked in neighbors.items()
+        # Leave unchanged lists (and their updated_at, used in the detail page ETag) alone.
+        if current.get(pk) != [n for n, _ in ranked]
+    ]
+    with transaction.atomic():
+        AnimalNeighbors.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['animal'],
+            update_fields=['neighbor_ids', 'scores', 'updated_at'],
+        )
+        AnimalNeighbors.objects.filter(pk__in=list(neighbors), stale_since__lte=started).update(stale_since=None)
+    return len(rows)
+
+
+def also_liked(animal_id, limit=None):
+    """Animals most often favorited together with ``animal_id``, best first."""
+    ids = AnimalNeighbors.objects.filter(pk=animal_id).values_list('neighbor_ids', flat=True).first() or []
+    ids = ids[:limit or _setting('ZOO_RECOMMEND_DISPLAY', 6)]
+    if not ids:
+        return []
+    animals = Animal.objects.only('name', 'species', 'image', 'derivatives_of').in_bulk(ids)
+    # Lists may still name animals deleted since they were computed.
+    return [animals[pk] for pk in ids if pk in animals]
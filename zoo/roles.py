@@ -0,0 +1,57 @@
+"""Cached role lookups.
+
+A user's Profile.role is memoized on the request, so role checks in
+role_required, views and templates cost one lookup per request instead
+of a Profile query each. Across requests it is cached (keyed by user id)
+only in the cache named by ZOO_ROLE_CACHE, which must be shared by all
+workers: the Profile receivers in zoo.signals drop the entry when a
+profile is saved or deleted, and a per-process cache would keep serving
+a revoked role in every other worker. Without one, the role is read from
+the database once per request.
+"""
+from django.conf import settings
+
+from .caching import shared_cache
+from .models import Profile
+
+CACHE_KEY_PREFIX = 'zoo:role:'
+# Stored for users without a profile so the miss is cached too.
+NO_ROLE = ''
+
+
+def _timeout():
+    return getattr(settings, 'ZOO_ROLE_CACHE_TIMEOUT', 60 * 60)
+
+
+def _cache():
+    return shared_cache(getattr(settings, 'ZOO_ROLE_CACHE', None))
+
+
+def _key(user_id):
+    return f'{CACHE_KEY_PREFIX}{user_id}'
+
+
+def role_for_user(user):
+    """The user's role, or NO_ROLE for anonymous users and users without a profile."""
+    if not user.is_authenticated:
+        return NO_ROLE
+    cache = _cache()
+    role = cache.get(_key(user.pk)) if cache is not None else None
+    if role is None:
+        role = Profile.objects.filter(user_id=user.pk).values_list('role', flat=True).first() or NO_ROLE
+        if cache is not None:
+            cache.set(_key(user.pk), role, _timeout())
+    return role
+
+
+def get_role(request):
+    """Role of ``request.user``, looked up once per request."""
+    if not hasattr(request, '_zoo_role'):
+        request._zoo_role = role_for_user(request.user)
+    return request._zoo_role
+
+
+def invalidate(user_id):
+    cache = _cache()
+    if cache is not None:
+        cache.delete(_key(user_id))
@@ -0,0 +1,174 @@
+"""Ranked full-text search over animals, approved blogs and facts.
+
+Documents live in the ``zoo_search`` FTS5 virtual table. Each row's rowid
+encodes the source object (``pk * ROWID_STRIDE + kind code``) so the
+signal handlers in zoo.signals can replace or drop a single document with
+an indexed rowid lookup. Results are ordered by BM25 with the title
+weighted above the other columns.
+"""
+import re
+
+from django.db import connection
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+TABLE = 'zoo_search'
+ROWID_STRIDE = 4
+KINDS = {'animal': 1, 'blog': 2, 'fact': 3}
+KIND_NAMES = {code: name for name, code in KINDS.items()}
+
+# bm25() weights for the title, keywords and body columns.
+WEIGHTS = (10.0, 4.0, 1.0)
+
+_SNIPPET_START = '\x02'
+_SNIPPET_END = '\x03'
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def is_available(using=None):
+    return (using or connection).vendor == 'sqlite'
+
+
+def create_table(cursor):
+    cursor.execute(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5('
+        "title, keywords, body, tokenize = 'porter unicode61', prefix = '2 3')"
+    )
+
+
+def drop_table(cursor):
+    cursor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+
+
+def _kind_of(instance):
+    return KINDS.get(instance._meta.model_name)
+
+
+def rowid_for(instance):
+    return instance.pk * ROWID_STRIDE + _kind_of(instance)
+
+
+def document_for(instance):
+    """Return (title, keywords, body) for an indexable instance, or None to drop it."""
+    kind = instance._meta.model_name
+    if kind == 'animal':
+        return (
+            instance.name,
+            ' '.join(filter(None, [instance.species, instance.scientific_name, instance.habitat])),
+            instance.description,
+        )
+    if kind == 'blog':
+        if not instance.approved:
+            return None
+        return (instance.title, '', instance.content)
+    if kind == 'fact':
+        return (instance.title, '', instance.content)
+    return None
+
+
+def index_instance(instance):
+    if not is_available() or _kind_of(instance) is None:
+        return
+    rowid = rowid_for(instance)
+    document = document_for(instance)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', [rowid])
+        if document is not None:
+            cursor.execute(
+                f'INSERT INTO {TABLE} (rowid, title, keywords, body) VALUES (%s, %s, %s, %s)',
+                [rowid, *document],
+            )
+
+
+def remove_instance(instance):
+    if not is_available() or _kind_of(instance) is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', [rowid_for(instance)])
+
+
+def indexed_querysets(Animal, Blog, Fact):
+    return [
+        Animal.objects.only('name', 'species', 'scientific_name', 'habitat', 'description'),
+        Blog.objects.filter(approved=True).only('title', 'content', 'approved'),
+        Fact.objects.only('title', 'content'),
+    ]
+
+
+def rebuild(batch_size=1000, querysets=None):
+    """Recreate the index from scratch; return the number of documents written."""
+    if querysets is None:
+        from .models import Animal, Blog, Fact
+        querysets = indexed_querysets(Animal, Blog, Fact)
+    written = 0
+    with connection.cursor() as cursor:
+        drop_table(cursor)
+        create_table(cursor)
+        sql = f'INSERT INTO {TABLE} (rowid, title, keywords, body) VALUES (%s, %s, %s, %s)'
+        for queryset in querysets:
+            batch = []
+            for obj in queryset.iterator(chunk_size=batch_size):
+                document = document_for(obj)
+                if document is not None:
+                    batch.append((rowid_for(obj), *document))
+                if len(batch) >= batch_size:
+                    cursor.executemany(sql, batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                cursor.executemany(sql, batch)
+                written += len(batch)
+    return written
+
+
+def build_match_query(q):
+    """Turn free text into an FTS5 query: every word must match, as a prefix."""
+    tokens = _TOKEN_RE.findall(q or '')
+    return ' '.join('"%s"*' % token.replace('"', '""') for token in tokens)
+
+
+def _highlight(snippet):
+    html = escape(snippet).replace(_SNIPPET_START, '<mark>').replace(_SNIPPET_END, '</mark>')
+    return mark_safe(html)
+
+
+def _url_for(kind, pk):
+    if kind == 'animal':
+        return reverse('animal_detail', args=[pk])
+    if kind == 'blog':
+        return reverse('blog_detail', args=[pk])
+    return None
+
+
+def search(q, limit=20, kinds=None):
+    """Return BM25-ranked hits as dicts with kind, id, title, snippet and url."""
+    match = build_match_query(q)
+    if not match or not is_available():
+        return []
+    params = [_SNIPPET_START, _SNIPPET_END, *WEIGHTS, match]
+    kind_filter = ''
+    if kinds:
+        codes = [KINDS[kind] for kind in kinds]
+        kind_filter = f" AND (rowid %% {ROWID_STRIDE}) IN ({', '.join(str(code) for code in codes)})"
+    sql = (
+        f"SELECT rowid, title, snippet({TABLE}, -1, %s, %s, '…', 16), bm25({TABLE}, %s, %s, %s) AS score "
+        f'FROM {TABLE} WHERE {TABLE} MATCH %s{kind_filter} ORDER BY score LIMIT %s'
+    )
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    results = []
+    for rowid, title, snippet, score in rows:
+        kind = KIND_NAMES[rowid % ROWID_STRIDE]
+        pk = rowid // ROWID_STRIDE
+        results.append({
+            'kind': kind,
+            'id': pk,
+            'title': title,
+            'snippet': _highlight(snippet),
+            'score': score,
+            'url': _url_for(kind, pk),
+        })
+    return results
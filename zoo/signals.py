@@ -1,8 +1,11 @@
-from django.db.models.signals import post_save
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.db.utils import OperationalError, ProgrammingError
-from .models import Profile
+from .models import Profile, Animal, Blog, Fact, Favorite, Quiz
+from . import dashboard, db, favorites, images, pagecache, quiz, recommend, roles, search, stats
 
 
 @receiver(post_save, sender=User)
@@ -26,3 +29,103 @@ def save_user_profile(sender, instance, **kwargs):
             instance.profile.save()
     except (OperationalError, ProgrammingError):
         pass
+
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_cached_role(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: roles.invalidate(user_id))
+
+
+# Counts move only once the write commits: a rolled-back save must not be counted.
+def count_created_object(sender, instance, created, raw=False, using=None, **kwargs):
+    if created and not raw:
+        transaction.on_commit(lambda: stats.adjust(sender, 1), using=using)
+
+
+def count_deleted_object(sender, instance, using=None, **kwargs):
+    transaction.on_commit(lambda: stats.adjust(sender, -1), using=using)
+
+
+for _model in stats.stat_models().values():
+    post_save.connect(count_created_object, sender=_model, dispatch_uid=f'zoo-stats-save-{_model.__name__}')
+    post_delete.connect(count_deleted_object, sender=_model, dispatch_uid=f'zoo-stats-delete-{_model.__name__}')
+
+
+def bump_page_generation(sender, instance, raw=False, **kwargs):
+    if not raw:
+        pagecache.bump(sender)
+
+
+for _model in pagecache.tracked_models():
+    post_save.connect(bump_page_generation, sender=_model, dispatch_uid=f'zoo-pagecache-save-{_model.__name__}')
+    post_delete.connect(bump_page_generation, sender=_model, dispatch_uid=f'zoo-pagecache-delete-{_model.__name__}')
+
+
+def index_search_document(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_instance(instance)
+
+
+def remove_search_document(sender, instance, **kwargs):
+    search.remove_instance(instance)
+
+
+for _model in (Animal, Blog, Fact):
+    post_save.connect(index_search_document, sender=_model, dispatch_uid=f'zoo-search-save-{_model.__name__}')
+    post_delete.connect(remove_search_document, sender=_model, dispatch_uid=f'zoo-search-delete-{_model.__name__}')
+
+
+def refresh_dashboard_sections(sender, instance, raw=False, **kwargs):
+    if not raw:
+        dashboard.refresh_for_model(sender)
+
+
+for _model in dashboard.MODEL_SECTIONS:
+    post_save.connect(refresh_dashboard_sections, sender=_model, dispatch_uid=f'zoo-dashboard-save-{_model.__name__}')
+    post_delete.connect(refresh_dashboard_sections, sender=_model, dispatch_uid=f'zoo-dashboard-delete-{_model.__name__}')
+
+
+@receiver(post_save, sender=Animal)
+def build_image_derivatives(sender, instance, raw=False, **kwargs):
+    if raw or not instance.image or images.derivatives_ready(instance):
+        return
+    name = instance.image.name
+    transaction.on_commit(lambda: images.schedule_derivatives(name))
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def invalidate_quiz_cache(sender, instance, **kwargs):
+    quiz.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Favorite)
+def count_added_favorite(sender, instance, created, raw=False, **kwargs):
+    # Part of the caller's transaction, unlike the cache updates below.
+    if created and not raw:
+        favorites.adjust_count(instance.animal_id, 1)
+
+
+@receiver(post_delete, sender=Favorite)
+def count_removed_favorite(sender, instance, **kwargs):
+    favorites.adjust_count(instance.animal_id, -1)
+
+
+@receiver(post_save, sender=Favorite)
+@receiver(post_delete, sender=Favorite)
+def invalidate_favorite_ids(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: favorites.invalidate(user_id))
+
+
+@receiver(post_save, sender=Favorite)
+@receiver(post_delete, sender=Favorite)
+def mark_neighbors_stale(sender, instance, **kwargs):
+    user_id, animal_id = instance.user_id, instance.animal_id
+    transaction.on_commit(lambda: recommend.favorite_changed(user_id, animal_id))
+
+
+connection_created.connect(db.configure_connection, dispatch_uid='zoo-sqlite-pragmas')
@@ -0,0 +1,227 @@
+"""Hashed, precompressed static files.
+
+``PrecompressedManifestStaticFilesStorage`` extends Django's manifest
+storage: after collectstatic has written the content-hashed copies it
+shrinks oversized images (capped at ZOO_STATIC_IMAGE_MAX_WIDTH and
+re-encoded from the source, so repeated runs give the same bytes) and writes ``.gz`` and, when the optional ``brotli`` package
+is installed, ``.br`` siblings of every compressible file.
+
+``PrecompressedStaticMiddleware`` serves STATIC_ROOT when there is no
+front-end server doing so (ZOO_STATIC_SERVE). It picks the best
+precompressed variant for the request's Accept-Encoding, so nothing is
+compressed per request. Hashed names get a one-year ``immutable``
+Cache-Control because their content can never change under that name.
+"""
+import gzip
+import io
+import mimetypes
+import os
+from functools import lru_cache
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.xml', '.map', '.ico', '.ttf', '.otf', '.eot')
+RESIZABLE = ('.jpg', '.jpeg', '.png', '.webp')
+MIN_COMPRESS_SIZE = 256
+ONE_YEAR = 365 * 24 * 60 * 60
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def compress_variants(data):
+    """{suffix: compressed bytes} for the encodings that actually shrink ``data``."""
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=11)
+    return {suffix: body for suffix, body in variants.items() if len(body) < len(data)}
+
+
+def shrink_image(data, ext):
+    """Return ``data`` downscaled/re-encoded, or None if that would not help."""
+    from PIL import Image, ImageOps
+
+    max_width = _setting('ZOO_STATIC_IMAGE_MAX_WIDTH', 1600)
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    image = ImageOps.exif_transpose(image)
+    if image.width > max_width:
+        image = image.resize((max_width, round(image.height * max_width / image.width)), Image.LANCZOS)
+    out = io.BytesIO()
+    if ext in ('.jpg', '.jpeg'):
+        image.convert('RGB').save(out, 'JPEG', quality=82, optimize=True, progressive=True)
+    elif ext == '.png':
+        image.save(out, 'PNG', optimize=True)
+    else:
+        image.save(out, 'WEBP', quality=82, method=6)
+    result = out.getvalue()
+    return result if len(result) < len(data) else None
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # Templates reference a few images that are not shipped; render their
+    # unhashed URL rather than failing the whole page.
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed = {}
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name is not None:
+                hashed[name] = hashed_name
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for name, hashed_name in hashed.items():
+            if self.optimize(name, hashed_name):
+                yield name, hashed_name, True
+
+    def optimize(self, name, hashed_name):
+        """Shrink/compress the hashed copy of ``name``; return True if anything was written."""
+        ext = os.path.splitext(name)[1].lower()
+        if ext not in RESIZABLE and ext not in COMPRESSIBLE:
+            return False
+        if ext in RESIZABLE:
+            # Django keeps an existing hashed file on later runs, so always
+            # shrink from the unhashed copy of the source: re-encoding the
+            # hashed file again would lose quality and change its bytes
+            # under a name that is served as immutable.
+            with self.open(name) as fh:
+                smaller = shrink_image(fh.read(), ext)
+            return smaller is not None and self._overwrite(hashed_name, smaller)
+        with self.open(hashed_name) as fh:
+            data = fh.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return False
+        written = False
+        for suffix, body in compress_variants(data).items():
+            written = self._overwrite(hashed_name + suffix, body) or written
+        return written
+
+    def _overwrite(self, name, data):
+        """Write ``data`` to ``name`` unless it already holds exactly that; return True if written."""
+        path = self.path(name)
+        try:
+            with open(path, 'rb') as fh:
+                if fh.read() == data:
+                    return False
+        except FileNotFoundError:
+            pass
+        with open(path, 'wb') as fh:
+            fh.write(data)
+        return True
+
+
+@lru_cache(maxsize=2048)
+def _resolve(relative):
+    """(path, {encoding: path}, immutable) for a file under STATIC_ROOT, or None."""
+    try:
+        path = safe_join(settings.STATIC_ROOT, relative)
+    except SuspiciousFileOperation:
+        return None
+    if not os.path.isfile(path):
+        return None
+    encoded = {}
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if os.path.isfile(path + suffix):
+            encoded[encoding] = path + suffix
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', {})
+    return path, encoded, relative in set(hashed_files.values())
+
+
+def _accepted_encodings(request):
+    header = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip().replace(' ', '')
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class PrecompressedStaticMiddleware:
+    """Serve STATIC_ROOT with precompressed variants and long-lived cache headers."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not _setting('ZOO_STATIC_SERVE', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        self.prefix = settings.STATIC_URL if settings.STATIC_URL.startswith('/') else '/' + settings.STATIC_URL
+
+    def _is_static(self, request):
+        return request.method in ('GET', 'HEAD') and request.path.startswith(self.prefix)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if self._is_static(request):
+            response = self.serve(request, request.path[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if self._is_static(request):
+            # stat()/open() are blocking; only static requests pay for the thread hop.
+            response = await sync_to_async(self.serve)(request, request.path[len(self.prefix):])
+            if response is not None:
+                return response
+        return await self.get_response(request)
+
+    def serve(self, request, relative):
+        resolved = _resolve(relative)
+        if resolved is None:
+            return None
+        path, encoded, immutable = resolved
+        mtime = int(os.stat(path).st_mtime)
+        response = get_conditional_response(request, last_modified=mtime)
+        if response is None:
+            accepted = _accepted_encodings(request)
+            encoding = next((e for e in ('br', 'gzip') if e in encoded and e in accepted), None)
+            content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+            response = FileResponse(
+                open(encoded.get(encoding, path), 'rb'),
+                content_type=content_type,
+                filename=os.path.basename(path),
+            )
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['Last-Modified'] = http_date(mtime)
+        if encoded:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        if immutable:
+            patch_cache_control(response, public=True, max_age=ONE_YEAR, immutable=True)
+        else:
+            patch_cache_control(response, public=True, max_age=_setting('ZOO_STATIC_MAX_AGE', 60 * 60))
+        return response
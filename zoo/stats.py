@@ -0,0 +1,81 @@
+"""Site-wide object counts kept in the cache.
+
+Counts are rebuilt from the database on a cold cache and then adjusted
+incrementally by the post_save/post_delete receivers in zoo.signals, so
+rendering the home page or dashboard does not issue COUNT(*) queries.
+
+The receivers only reach the cache of the worker that did the write, so
+the counts are kept for ZOO_STATS_CACHE_TIMEOUT only in the cache named
+by ZOO_STATS_CACHE, which must be shared by all workers. Without one they
+are kept in each worker's default cache for ZOO_STATS_LOCAL_CACHE_TIMEOUT,
+short enough that other workers' counts do not drift for long.
+"""
+from django.conf import settings
+from django.core.cache import cache as local_cache
+
+from .caching import shared_cache
+
+CACHE_KEY_PREFIX = 'zoo:stats:'
+
+
+def stat_models():
+    from .models import Animal, Category, Zone, Quiz, Blog, Feedback
+    return {
+        'animals': Animal,
+        'categories': Category,
+        'zones': Zone,
+        'quizzes': Quiz,
+        'blogs': Blog,
+        'feedback': Feedback,
+    }
+
+
+def _cache():
+    """(cache, timeout) to keep the counts in."""
+    cache = shared_cache(getattr(settings, 'ZOO_STATS_CACHE', None))
+    if cache is not None:
+        # A TTL bounds drift from writes that bypass signals (bulk_create, raw SQL).
+        return cache, getattr(settings, 'ZOO_STATS_CACHE_TIMEOUT', 60 * 60)
+    return local_cache, getattr(settings, 'ZOO_STATS_LOCAL_CACHE_TIMEOUT', 30)
+
+
+def _key(name):
+    return f'{CACHE_KEY_PREFIX}{name}'
+
+
+def get_site_stats():
+    models = stat_models()
+    keys = {_key(name): name for name in models}
+    cache, timeout = _cache()
+    cached = cache.get_many(list(keys))
+    stats = {keys[key]: value for key, value in cached.items()}
+    missing = {name: models[name].objects.count() for name in models if name not in stats}
+    if missing:
+        cache.set_many({_key(name): value for name, value in missing.items()}, timeout)
+        stats.update(missing)
+    return {name: stats[name] for name in models}
+
+
+def _stat_name(model):
+    for name, stat_model in stat_models().items():
+        if stat_model is model:
+            return name
+    return None
+
+
+def adjust(model, delta):
+    name = _stat_name(model)
+    if name is None:
+        return
+    cache, _ = _cache()
+    try:
+        cache.incr(_key(name), delta)
+    except ValueError:
+        # Cold key: the next read rebuilds it from the database.
+        pass
+
+
+def invalidate():
+    """Drop cached counts, e.g. after bulk writes that bypass signals."""
+    cache, _ = _cache()
+    cache.delete_many([_key(name) for name in stat_models()])
@@ -0,0 +1,8 @@
+from django.core.mail import send_mail as django_send_mail
+
+from .jobs import task
+
+
+@task
+def send_mail(subject, message, from_email, recipient_list):
+    django_send_mail(subject, message, from_email, recipient_list, fail_silently=False)
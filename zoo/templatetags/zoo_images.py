@@ -0,0 +1,14 @@
+from django import template
+from zoo import images
+
+register = template.Library()
+
+
+@register.inclusion_tag('zoo/responsive_image.html')
+def responsive_image(image, alt='', css_class='', sizes='100vw'):
+    """<picture> for an Animal.image with WebP/JPEG srcsets once derivatives exist."""
+    context = {'image': image, 'alt': alt, 'css_class': css_class, 'sizes': sizes}
+    if image and images.derivatives_ready(image.instance):
+        context['webp_srcset'] = images.srcset(image.name, 'webp')
+        context['jpeg_srcset'] = images.srcset(image.name, 'jpeg')
+    return context
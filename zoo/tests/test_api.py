@@ -0,0 +1,25 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from zoo.models import Animal
+
+TOO_BIG = 10 ** 23
+
+
+class ApiIdTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.animal = Animal.objects.create(name='Okapi')
+
+    def test_batch(self):
+        missing = self.animal.pk + 1000
+        response = self.client.get(reverse('api_batch', args=['animals']), {'ids': f'{missing},{self.animal.pk}', 'fields': 'id'})
+        self.assertEqual(response.json(), {'results': [{'id': self.animal.pk}], 'missing': [missing]})
+
+    def test_batch_rejects_out_of_range_ids(self):
+        response = self.client.get(reverse('api_batch', args=['animals']), {'ids': f'{self.animal.pk},{TOO_BIG}'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_detail_with_an_out_of_range_id_is_not_found(self):
+        self.assertEqual(self.client.get(reverse('api_detail', args=['animals', self.animal.pk])).status_code, 200)
+        self.assertEqual(self.client.get(reverse('api_detail', args=['animals', TOO_BIG])).status_code, 404)
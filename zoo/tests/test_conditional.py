@@ -0,0 +1,28 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from zoo.counters import flush_view_counts
+from zoo.models import Animal, AnimalNeighbors
+
+
+@override_settings(ZOO_PAGE_CACHE_ENABLED=False)
+class AnimalDetailConditionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.animal, cls.other = Animal.objects.create(name='Okapi'), Animal.objects.create(name='Tapir')
+        cls.url = reverse('animal_detail', args=[cls.animal.pk])
+
+    def tearDown(self):
+        # Write buffered detail-page views while the test database exists.
+        flush_view_counts()
+
+    def test_unchanged_page_is_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_new_also_liked_list_changes_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        AnimalNeighbors.objects.create(animal=self.animal, neighbor_ids=[self.other.pk], scores=[1.0])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
@@ -0,0 +1,48 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from zoo.counters import CACHE_KEY_PREFIX, view_counter
+from zoo.models import Animal
+
+
+class FlushViewCountsCommandTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.animals = [Animal.objects.create(name=f'Animal {i}') for i in range(3)]
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        caches_setting = {
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'views': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': self.cache_dir},
+        }
+        overridden = override_settings(CACHES=caches_setting, ZOO_VIEW_COUNTER_CACHE='views')
+        overridden.enable()
+        self.addCleanup(overridden.disable)
+        # Views below are buffered by "another worker"; this process has seen none.
+        self.addCleanup(view_counter.flush)
+        view_counter.flush()
+
+    def flush(self, *args):
+        out = StringIO()
+        call_command('flushviewcounts', *args, stdout=out)
+        return out.getvalue()
+
+    def test_drains_counters_set_by_other_workers(self):
+        shared = caches['views']
+        shared.set(f'{CACHE_KEY_PREFIX}{self.animals[0].pk}', 4, timeout=None)
+        shared.set(f'{CACHE_KEY_PREFIX}{self.animals[2].pk}', 3, timeout=None)
+        self.assertIn('Flushed 7 buffered view(s).', self.flush('--batch-size', '2'))
+        counts = dict(Animal.objects.values_list('pk', 'view_count'))
+        self.assertEqual([counts[a.pk] for a in self.animals], [4, 0, 3])
+        self.assertIn('Flushed 0 buffered view(s).', self.flush())
+
+    def test_requires_a_shared_cache(self):
+        with override_settings(ZOO_VIEW_COUNTER_CACHE=None), self.assertRaises(CommandError):
+            self.flush()
@@ -0,0 +1,28 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from zoo.models import Animal
+
+
+class ImportCatalogTests(TestCase):
+    def import_jsonl(self, rows):
+        fd, path = tempfile.mkstemp(suffix='.jsonl')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            fh.writelines(json.dumps(row) + '\n' for row in rows)
+        call_command('importcatalog', path, '--no-media', stdout=StringIO())
+
+    def test_non_string_json_values(self):
+        self.import_jsonl([
+            {'id': 17, 'name': 'Okapi', 'species': 42, 'category': 3, 'zone': 1.5, 'diet': None},
+            {'catalog_id': 0, 'name': 1984},
+        ])
+        okapi = Animal.objects.select_related('category', 'zone').get(catalog_id='17')
+        self.assertEqual((okapi.name, okapi.species, okapi.diet), ('Okapi', '42', ''))
+        self.assertEqual((okapi.category.name, okapi.zone.name), ('3', '1.5'))
+        self.assertEqual(Animal.objects.get(catalog_id='0').name, '1984')
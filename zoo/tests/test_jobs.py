@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from zoo import jobs
+from zoo.models import Job
+
+
+@jobs.task
+def fail(reason):
+    raise RuntimeError(reason)
+
+
+@override_settings(ZOO_CONTACT_EMAIL='keepers@zoo.example')
+class JobQueueTests(TestCase):
+    def post_contact(self):
+        return self.client.post(reverse('contact'), {
+            'name': 'Ada', 'email': 'ada@example.com', 'subject': 'General', 'urgency': 'Normal',
+            'message': 'Hello keepers',
+        })
+
+    def test_contact_enqueues_the_email(self):
+        self.assertEqual(self.post_contact().status_code, 200)
+        job = Job.objects.get()
+        self.assertEqual((job.task, job.status), ('zoo.tasks.send_mail', 'pending'))
+        self.assertEqual(job.payload['recipient_list'], ['keepers@zoo.example'])
+        self.assertEqual(mail.outbox, [])
+
+    def test_run_pending_delivers_the_email(self):
+        self.post_contact()
+        self.assertEqual(jobs.run_pending(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['keepers@zoo.example'])
+        self.assertIn('Hello keepers', mail.outbox[0].body)
+        self.assertEqual(Job.objects.get().status, 'done')
+        self.assertEqual(jobs.run_pending(), (0, 0))
+
+    def test_failed_job_is_retried_with_backoff(self):
+        job = jobs.enqueue(fail, reason='SMTP down')
+        before = timezone.now()
+        with self.assertLogs('zoo.jobs', 'WARNING'):
+            self.assertEqual(jobs.run_pending(), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('pending', 1))
+        self.assertIn('SMTP down', job.last_error)
+        self.assertGreaterEqual(job.run_at, before + jobs.backoff(1))
+        self.assertLessEqual(job.run_at, timezone.now() + jobs.backoff(1))
+        # Not due again until the backoff has passed.
+        self.assertEqual(jobs.run_pending(), (0, 0))
+
+    def test_job_is_dead_after_max_attempts(self):
+        job = jobs.enqueue(fail, max_attempts=3, reason='SMTP down')
+        for attempt in range(1, 4):
+            Job.objects.filter(pk=job.pk).update(run_at=timezone.now() - timedelta(seconds=1))
+            with self.assertLogs('zoo.jobs', 'WARNING'):
+                self.assertEqual(jobs.run_pending(), (0, 1))
+            job.refresh_from_db()
+            self.assertEqual(job.attempts, attempt)
+        self.assertEqual(job.status, 'dead')
+        self.assertIsNotNone(job.finished_at)
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(jobs.run_pending(), (0, 0))
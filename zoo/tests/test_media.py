@@ -0,0 +1,145 @@
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils.http import http_date
+
+from zoo.media import _ranged, parse_range
+
+CONTENT = bytes(range(256)) * 4  # 1024 distinguishable bytes
+SIZE = len(CONTENT)
+ETAG = '"abc-400"'
+LAST_MODIFIED = datetime(2024, 5, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_ignored_headers(self):
+        for header in (None, '', 'bytes', 'items=0-1', 'bytes=abc', 'bytes=-', 'bytes=5-2', 'bytes=0-1,x'):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, SIZE))
+
+    def test_single_range(self):
+        self.assertEqual(parse_range('bytes=0-99', SIZE), [(0, 99)])
+        self.assertEqual(parse_range('bytes = 10 - 19', SIZE), [(10, 19)])
+
+    def test_open_ended_range(self):
+        self.assertEqual(parse_range('bytes=1000-', SIZE), [(1000, SIZE - 1)])
+
+    def test_end_is_clamped_to_the_file(self):
+        self.assertEqual(parse_range('bytes=1000-5000', SIZE), [(1000, SIZE - 1)])
+
+    def test_suffix_range(self):
+        self.assertEqual(parse_range('bytes=-100', SIZE), [(SIZE - 100, SIZE - 1)])
+        # Longer than the file: the whole file.
+        self.assertEqual(parse_range('bytes=-5000', SIZE), [(0, SIZE - 1)])
+
+    def test_multiple_ranges_are_sorted_and_merged(self):
+        self.assertEqual(parse_range('bytes=500-599,0-99', SIZE), [(0, 99), (500, 599)])
+        self.assertEqual(parse_range('bytes=0-99,50-149,150-199', SIZE), [(0, 199)])
+        self.assertEqual(parse_range('bytes=0-9,-10', SIZE), [(0, 9), (SIZE - 10, SIZE - 1)])
+
+    def test_unsatisfiable(self):
+        self.assertEqual(parse_range(f'bytes={SIZE}-', SIZE), [])
+        self.assertEqual(parse_range('bytes=-0', SIZE), [])
+        self.assertEqual(parse_range(f'bytes={SIZE}-,{SIZE + 10}-{SIZE + 20}', SIZE), [])
+
+    def test_unsatisfiable_parts_are_dropped(self):
+        self.assertEqual(parse_range(f'bytes=0-9,{SIZE}-', SIZE), [(0, 9)])
+
+    @override_settings(ZOO_MEDIA_MAX_RANGES=2)
+    def test_too_many_ranges_are_ignored(self):
+        self.assertIsNone(parse_range('bytes=0-1,3-4,6-7', SIZE))
+
+
+class RangedResponseTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        fd, cls.path = tempfile.mkstemp(suffix='.mp3')
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(CONTENT)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.path)
+        super().tearDownClass()
+
+    def respond(self, method='get', **headers):
+        request = getattr(RequestFactory(), method)('/animal/1/media/sound/', **headers)
+        response = _ranged(request, self.path, SIZE, 'audio/mpeg', ETAG, LAST_MODIFIED)
+        self.addCleanup(response.close)
+        return response
+
+    def body(self, response):
+        return b''.join(response.streaming_content) if response.streaming else response.content
+
+    def test_no_range_is_the_whole_file(self):
+        response = self.respond()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), CONTENT)
+
+    def test_single_range(self):
+        response = self.respond(HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{SIZE}')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(self.body(response), CONTENT[100:200])
+
+    def test_suffix_range(self):
+        response = self.respond(HTTP_RANGE='bytes=-24')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes {SIZE - 24}-{SIZE - 1}/{SIZE}')
+        self.assertEqual(self.body(response), CONTENT[-24:])
+
+    def test_multiple_ranges(self):
+        response = self.respond(HTTP_RANGE='bytes=0-9,500-509')
+        self.assertEqual(response.status_code, 206)
+        content_type = response['Content-Type']
+        self.assertTrue(content_type.startswith('multipart/byteranges; boundary='))
+        boundary = content_type.split('boundary=')[1]
+        body = self.body(response)
+        self.assertEqual(int(response['Content-Length']), len(body))
+        parts = body.split(f'--{boundary}'.encode())
+        # Leading CRLF, two parts, closing "--".
+        self.assertEqual(len(parts), 4)
+        self.assertEqual(parts[-1], b'--\r\n')
+        for part, (start, end) in zip(parts[1:3], [(0, 9), (500, 509)]):
+            headers, _, data = part.partition(b'\r\n\r\n')
+            self.assertIn(f'Content-Range: bytes {start}-{end}/{SIZE}'.encode(), headers)
+            self.assertIn(b'Content-Type: audio/mpeg', headers)
+            self.assertEqual(data.removesuffix(b'\r\n'), CONTENT[start:end + 1])
+
+    def test_unsatisfiable_range_is_416(self):
+        response = self.respond(HTTP_RANGE=f'bytes={SIZE}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{SIZE}')
+
+    def test_malformed_range_is_the_whole_file(self):
+        response = self.respond(HTTP_RANGE='bytes=oops')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), CONTENT)
+
+    def test_if_range_matching_etag(self):
+        response = self.respond(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=ETAG)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self.body(response), CONTENT[:10])
+
+    def test_if_range_mismatched_etag_is_the_whole_file(self):
+        for if_range in ('"other"', f'W/{ETAG}'):
+            with self.subTest(if_range=if_range):
+                response = self.respond(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=if_range)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(self.body(response), CONTENT)
+
+    def test_if_range_date(self):
+        current = http_date(LAST_MODIFIED.timestamp())
+        response = self.respond(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=current)
+        self.assertEqual(response.status_code, 206)
+        older = http_date((LAST_MODIFIED - timedelta(hours=1)).timestamp())
+        response = self.respond(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=older)
+        self.assertEqual(response.status_code, 200)
+
+    def test_ranges_only_apply_to_get_and_head(self):
+        response = self.respond(method='post', HTTP_RANGE='bytes=0-9')
+        self.assertEqual(response.status_code, 200)
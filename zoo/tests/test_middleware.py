@@ -0,0 +1,38 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+
+@override_settings(ZOO_PERF_SERVER_TIMING=None, DEBUG=False)
+class ServerTimingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.visitor = User.objects.create_user('visitor', password='x')
+        cls.staff = User.objects.create_user('keeper', password='x', is_staff=True)
+
+    def timing(self, client, user=None):
+        if user is not None:
+            client.force_login(user)
+        return client.get(reverse('contact')).get('Server-Timing')
+
+    def test_hidden_from_visitors(self):
+        self.assertIsNone(self.timing(self.client))
+        self.assertIsNone(self.timing(self.client, self.visitor))
+
+    def test_sent_to_staff(self):
+        self.assertIn('queries', self.timing(self.client, self.staff))
+
+    def test_sent_in_debug(self):
+        with self.settings(DEBUG=True):
+            self.assertIn('queries', self.timing(self.client))
+
+    def test_setting_overrides_the_default(self):
+        with self.settings(ZOO_PERF_SERVER_TIMING=True):
+            self.assertIsNotNone(self.timing(self.client))
+        with self.settings(ZOO_PERF_SERVER_TIMING=False):
+            self.assertIsNone(self.timing(self.client, self.staff))
+
+    async def test_asgi(self):
+        self.assertIsNone((await self.async_client.get(reverse('contact'))).get('Server-Timing'))
+        await self.async_client.aforce_login(self.staff)
+        self.assertIn('queries', (await self.async_client.get(reverse('contact')))['Server-Timing'])
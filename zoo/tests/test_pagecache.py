@@ -0,0 +1,40 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from zoo import pagecache
+from zoo.models import Blog
+
+
+@override_settings(ZOO_PAGE_CACHE_ENABLED=True, ZOO_PAGE_SIZE=2)
+class AnonymousPageCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Blog.objects.bulk_create([Blog(title=f'Post {i}', content='Hi', approved=True) for i in range(3)])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_unknown_params_share_the_cached_page(self):
+        url = reverse('blog_list')
+        first = self.client.get(url, {'junk': '1'})
+        self.assertEqual(first['X-Page-Cache'], 'MISS')
+        self.assertNotIn('junk', first.content.decode())
+        self.assertEqual(self.client.get(url, {'junk': '2'})['X-Page-Cache'], 'HIT')
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'HIT')
+
+    def test_params_the_view_reads_are_part_of_the_key(self):
+        url = reverse('blog_list')
+        next_query = self.client.get(url).context['blogs'].next_query
+        self.assertEqual(self.client.get(f'{url}?{next_query}')['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.client.get(f'{url}?{next_query}&junk=1')['X-Page-Cache'], 'HIT')
+
+    def test_missing_generation_is_not_reused(self):
+        (before,) = pagecache.generations([Blog])
+        pagecache.bump(Blog)
+        self.assertEqual(pagecache.generations([Blog]), [before + 1])
+        # Evicted counters restart from a value no earlier counter can have held.
+        cache.delete(pagecache._generation_key(Blog))
+        (after,) = pagecache.generations([Blog])
+        self.assertGreater(after, before + 1)
+        self.assertEqual(pagecache.generations([Blog]), [after])
@@ -0,0 +1,138 @@
+import base64
+import json
+
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from zoo.models import Animal, Blog
+from zoo.pagination import decode_cursor, encode_cursor, paginate
+
+ORDERING = ['-created_at', '-id']
+
+
+def raw_cursor(values):
+    """A cursor as a client could forge it: any JSON, base64-encoded."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+class DecodeCursorTests(TestCase):
+    def test_round_trip(self):
+        animal = Animal.objects.create(name='Okapi')
+        values = decode_cursor(encode_cursor([animal.created_at, animal.pk]), ORDERING, Animal)
+        self.assertEqual(values, [animal.created_at, animal.pk])
+
+    def test_values_are_converted_to_field_types(self):
+        values = decode_cursor(raw_cursor(['2024-05-01T12:00:00+00:00', '7']), ORDERING, Animal)
+        self.assertEqual(values[0].isoformat(), '2024-05-01T12:00:00+00:00')
+        self.assertEqual(values[1], 7)
+
+    def test_malformed_cursors_are_rejected(self):
+        for cursor in ('not base64!', raw_cursor('abc')[:-1], base64.urlsafe_b64encode(b'\xff\xfe').decode()):
+            with self.subTest(cursor=cursor):
+                self.assertIsNone(decode_cursor(cursor, ORDERING, Animal))
+
+    def test_wrong_shapes_are_rejected(self):
+        for values in ({'created_at': 1}, 'abc', [], ['2024-05-01T12:00:00+00:00'], ['2024-05-01', 1, 2]):
+            with self.subTest(values=values):
+                self.assertIsNone(decode_cursor(raw_cursor(values), ORDERING, Animal))
+
+    def test_tampered_values_are_rejected(self):
+        for values in (
+            ['abc', 1],
+            [{'a': 1}, 1],
+            [[1], 1],
+            [1, 1],
+            [None, 1],
+            ['2024-05-01T12:00:00+00:00', 'abc'],
+            ['2024-05-01T12:00:00+00:00', None],
+            ['2024-05-01T12:00:00+00:00', 10 ** 30],
+            ['2024-13-45T99:00:00', 1],
+        ):
+            with self.subTest(values=values):
+                self.assertIsNone(decode_cursor(raw_cursor(values), ORDERING, Animal))
+
+
+class PaginateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.animals = [Animal.objects.create(name=f'Animal {i}') for i in range(5)]
+        # Newest first, as listed.
+        cls.listed = sorted(cls.animals, key=lambda a: (a.created_at, a.pk), reverse=True)
+
+    def page(self, **params):
+        request = RequestFactory().get('/animals/', params)
+        return paginate(request, Animal.objects.all(), ORDERING, per_page=2)
+
+    def test_pages_forward_and_back(self):
+        first = self.page()
+        self.assertEqual(list(first), self.listed[:2])
+        self.assertFalse(first.has_previous)
+        second = self.page(after=first.next_cursor)
+        self.assertEqual(list(second), self.listed[2:4])
+        back = self.page(before=second.previous_cursor)
+        self.assertEqual(list(back), self.listed[:2])
+
+    def test_last_page_has_no_next(self):
+        second = self.page(after=self.page().next_cursor)
+        last = self.page(after=second.next_cursor)
+        self.assertEqual(list(last), self.listed[4:])
+        self.assertFalse(last.has_next)
+        self.assertTrue(last.has_previous)
+
+    def test_cursor_past_the_end_gives_an_empty_page(self):
+        oldest = self.listed[-1]
+        page = self.page(after=encode_cursor([oldest.created_at, oldest.pk]))
+        self.assertEqual(list(page), [])
+        self.assertFalse(page.has_next)
+        self.assertIsNone(page.next_cursor)
+
+    def test_cursor_before_the_start_gives_an_empty_page(self):
+        newest = self.listed[0]
+        page = self.page(before=encode_cursor([newest.created_at, newest.pk]))
+        self.assertEqual(list(page), [])
+        self.assertFalse(page.has_previous)
+
+    def test_forged_cursor_between_rows(self):
+        # Valid values that match no row still split the list in the right place.
+        third = self.listed[2]
+        page = self.page(after=encode_cursor([third.created_at, third.pk + 1000]))
+        self.assertEqual(list(page), self.listed[2:4])
+
+    def test_invalid_cursor_shows_the_first_page(self):
+        for params in ({'after': raw_cursor(['abc', 1])}, {'before': raw_cursor([{'a': 1}, 1])}, {'after': '%%%'}):
+            with self.subTest(params=params):
+                page = self.page(**params)
+                self.assertEqual(list(page), self.listed[:2])
+                self.assertFalse(page.has_previous)
+
+
+@override_settings(ZOO_PAGE_CACHE_ENABLED=False)
+class CursorViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(3):
+            Animal.objects.create(name=f'Animal {i}')
+        Blog.objects.create(title='Hello', content='Hi', approved=True)
+
+    def test_bad_cursors_do_not_error(self):
+        urls = [
+            reverse('animal_list'),
+            reverse('animal_cards'),
+            reverse('blog_list'),
+            reverse('api_list', args=['animals']),
+            reverse('api_list', args=['blogs']),
+        ]
+        cursors = [raw_cursor(['abc', 1]), raw_cursor([{'a': 1}, 1]), raw_cursor(['2024-05-01T12:00:00+00:00', 10 ** 30])]
+        for url in urls:
+            for key in ('after', 'before'):
+                for cursor in cursors:
+                    with self.subTest(url=url, key=key, cursor=cursor):
+                        response = self.client.get(url, {key: cursor})
+                        self.assertEqual(response.status_code, 200)
+
+    def test_api_treats_a_bad_cursor_as_the_first_page(self):
+        url = reverse('api_list', args=['animals'])
+        first = self.client.get(url, {'fields': 'id'}).json()
+        bad = self.client.get(url, {'fields': 'id', 'after': raw_cursor(['abc', 1])}).json()
+        self.assertEqual(bad['results'], first['results'])
+        self.assertIsNone(bad['previous'])
@@ -0,0 +1,151 @@
+import re
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from zoo.counters import flush_view_counts
+from zoo.management.commands.checkqueryplans import plan_problems
+from zoo.models import (
+    Animal, AnimalNeighbors, AnimalViewBucket, Blog, Category, Fact, Favorite, Feedback, Quiz, Zone,
+)
+
+# Small reference tables that pages read in full on purpose.
+SMALL_TABLES = {'zoo_category', 'zoo_fact', 'zoo_zone'}
+# Trending ranks by a score computed per request window, so it has to sort;
+# the result is cached for ZOO_TRENDING_CACHE_TIMEOUT seconds.
+SORTS_COMPUTED_SCORE = re.compile(r'FROM "zoo_animalviewbucket"')
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return '\n'.join(row[-1] for row in cursor.fetchall())
+
+
+@override_settings(ZOO_PAGE_CACHE_ENABLED=False)
+class ViewQueryPlanTests(TestCase):
+    """Every SELECT a page runs must seek through an index rather than scan or sort."""
+
+    @classmethod
+    def setUpTestData(cls):
+        categories = Category.objects.bulk_create(
+            [Category(name=f'Category {i}', slug=f'category-{i}') for i in range(3)]
+        )
+        zones = Zone.objects.bulk_create([Zone(name=f'Zone {i}') for i in range(2)])
+        Animal.objects.bulk_create([
+            Animal(name=f'Animal {i}', category=categories[i % 3], zone=zones[i % 2], view_count=i, favorite_count=i % 4)
+            for i in range(60)
+        ])
+        cls.animals = list(Animal.objects.order_by('pk'))
+        cls.category = categories[0]
+        cls.visitor = User.objects.create_user('visitor', password='x')
+        cls.admin = User.objects.create_user('keeper', password='x', is_staff=True)
+        cls.admin.profile.role = 'admin'
+        cls.admin.profile.save()
+        Blog.objects.bulk_create([
+            Blog(title=f'Post {i}', content='Some *words*.', author=cls.visitor, approved=i % 5 != 0)
+            for i in range(40)
+        ])
+        Feedback.objects.bulk_create([Feedback(user=cls.visitor, message=f'Nice {i}', rating=4) for i in range(30)])
+        Favorite.objects.bulk_create([Favorite(user=cls.visitor, animal=animal) for animal in cls.animals[:30]])
+        Fact.objects.bulk_create([Fact(title=f'Fact {i}', content='...') for i in range(5)])
+        Quiz.objects.bulk_create([
+            Quiz(question=f'Q{i}?', options='["a", "b"]', options_list=['a', 'b'], correct_answer='a',
+                 difficulty=('easy', 'medium', 'hard')[i % 3])
+            for i in range(30)
+        ])
+        hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+        AnimalViewBucket.objects.bulk_create([
+            AnimalViewBucket(animal=animal, start=hour - timedelta(hours=h), count=h + 1)
+            for animal in cls.animals[:10] for h in range(3)
+        ])
+        AnimalNeighbors.objects.bulk_create([
+            AnimalNeighbors(animal=cls.animals[0], neighbor_ids=[a.pk for a in cls.animals[1:7]], scores=[0.5] * 6),
+        ])
+
+    def setUp(self):
+        # Cached stats, trending and question data would hide their queries.
+        cache.clear()
+
+    def tearDown(self):
+        # Write buffered detail-page views while the test database exists.
+        flush_view_counts()
+
+    def assert_plans(self, url, indexes, user=None, **params):
+        """Request ``url``, EXPLAIN every SELECT it ran, and check the plans; return the response."""
+        if user is not None:
+            self.client.force_login(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, url)
+        plans = []
+        for query in queries.captured_queries:
+            sql = query['sql']
+            if not sql.startswith('SELECT'):
+                continue
+            plan = explain(sql)
+            plans.append(plan)
+            problems = [
+                problem for problem in plan_problems(plan)
+                if problem.removeprefix('full scan of ') not in SMALL_TABLES
+                and not (problem.startswith('temp B-tree') and SORTS_COMPUTED_SCORE.search(sql))
+            ]
+            self.assertEqual(problems, [], f'{url}: {sql}\n{plan}')
+        for index in indexes:
+            self.assertTrue(
+                any(index in plan for plan in plans),
+                f'{url} did not use {index}:\n' + '\n'.join(plans),
+            )
+        return response
+
+    def test_home(self):
+        self.assert_plans(reverse('home'), ['zoo_animal_created', 'zoo_feedback_created'])
+
+    def test_animal_list(self):
+        response = self.assert_plans(reverse('animal_list'), ['zoo_animal_created'])
+        next_query = response.context['animals'].next_query
+        self.assertIsNotNone(next_query)
+        self.assert_plans(f"{reverse('animal_list')}?{next_query}", ['zoo_animal_created'])
+
+    def test_category_list(self):
+        url = reverse('category_detail', args=[self.category.slug])
+        response = self.assert_plans(url, ['zoo_animal_category_created'])
+        self.assert_plans(f"{url}?{response.context['animals'].next_query}", ['zoo_animal_category_created'])
+
+    def test_animal_cards(self):
+        self.assert_plans(reverse('animal_cards'), ['zoo_animal_created'])
+        self.assert_plans(reverse('animal_cards'), ['zoo_animal_category_created'], category=self.category.slug)
+
+    def test_animal_detail(self):
+        self.assert_plans(reverse('animal_detail', args=[self.animals[0].pk]), [], user=self.visitor)
+
+    def test_blog_list(self):
+        response = self.assert_plans(reverse('blog_list'), ['zoo_blog_posted'])
+        self.assert_plans(f"{reverse('blog_list')}?{response.context['blogs'].next_query}", ['zoo_blog_posted'])
+
+    def test_favorites_list(self):
+        self.assert_plans(reverse('favorites_list'), ['zoo_favorite_user_id'], user=self.visitor)
+
+    def test_quiz(self):
+        self.assert_plans(reverse('take_quiz'), ['zoo_quiz_rand_key'])
+        self.assert_plans(reverse('take_quiz'), ['zoo_quiz_difficulty_rand'], difficulty='easy')
+
+    def test_dashboard(self):
+        # No snapshot yet, so the request builds every section inline.
+        self.assert_plans(
+            reverse('dashboard'), ['zoo_animal_created', 'zoo_animal_views', 'zoo_animal_favorite_count'],
+            user=self.visitor,
+        )
+
+    def test_manage_animals(self):
+        self.assert_plans(reverse('manage_animals'), ['zoo_animal_created'], user=self.admin)
+
+    def test_api_lists(self):
+        self.assert_plans(reverse('api_list', args=['animals']), ['zoo_animal_created'])
+        self.assert_plans(reverse('api_list', args=['blogs']), ['zoo_blog_posted'])
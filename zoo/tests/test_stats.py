@@ -0,0 +1,43 @@
+import shutil
+import tempfile
+
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+
+from zoo import stats
+from zoo.models import Zone
+
+
+class SiteStatsCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_counts_follow_writes(self):
+        self.assertEqual(stats.get_site_stats()['zones'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            zone = Zone.objects.create(name='Savanna')
+        self.assertEqual(stats.get_site_stats()['zones'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            zone.delete()
+        self.assertEqual(stats.get_site_stats()['zones'], 0)
+
+    @override_settings(ZOO_STATS_CACHE=None, ZOO_STATS_LOCAL_CACHE_TIMEOUT=5)
+    def test_without_a_shared_cache_counts_are_kept_briefly(self):
+        self.assertEqual(stats._cache(), (cache, 5))
+
+    @override_settings(ZOO_STATS_CACHE='default')
+    def test_locmem_is_not_a_shared_cache(self):
+        self.assertEqual(stats._cache(), (cache, 30))
+
+    def test_shared_cache(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        caches_setting = {
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'shared': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+        }
+        with override_settings(CACHES=caches_setting, ZOO_STATS_CACHE='shared', ZOO_STATS_CACHE_TIMEOUT=600):
+            self.assertEqual(stats._cache(), (caches['shared'], 600))
+            stats.get_site_stats()
+            self.assertEqual(caches['shared'].get(stats._key('zones')), 0)
+            self.assertIsNone(caches['default'].get(stats._key('zones')))
@@ -0,0 +1,157 @@
+"""Time-windowed trending animals.
+
+Animal detail views reach the database through the write-behind buffer in
+zoo.counters, which also adds each flush to an hourly AnimalViewBucket row
+(animal, hour, count). The compacttrending command folds hourly buckets
+older than ZOO_TRENDING_HOURLY_RETENTION into daily buckets and drops daily
+buckets older than ZOO_TRENDING_DAILY_RETENTION, so the table stays small.
+
+Rankings only read buckets: every bucket in the window gets an exponential
+decay weight based on its age, and the weighted sum per animal is computed
+in a single grouped query. Results are cached for a short time.
+"""
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Case, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import TruncDay
+from django.utils import timezone
+
+from .models import Animal, AnimalViewBucket
+
+CACHE_KEY_PREFIX = 'zoo:trending:'
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+RESOLUTIONS = {'hour': HOUR, 'day': DAY}
+
+# window name -> (length, decay half-life)
+WINDOWS = {
+    '1h': (timedelta(hours=1), timedelta(minutes=30)),
+    '24h': (timedelta(hours=24), timedelta(hours=6)),
+    '7d': (timedelta(days=7), timedelta(days=2)),
+}
+DEFAULT_WINDOW = '24h'
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _floor(moment, resolution):
+    moment = moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+    if resolution == 'day':
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def _upsert(resolution, rows):
+    """Add ``(animal_id, start, count)`` rows to their buckets."""
+    if not rows:
+        return
+    table = connection.ops.quote_name(AnimalViewBucket._meta.db_table)
+    count = connection.ops.quote_name('count')
+    sql = (
+        f'INSERT INTO {table} (animal_id, resolution, start, {count}) VALUES (%s, %s, %s, %s) '
+        f'ON CONFLICT (resolution, start, animal_id) DO UPDATE SET {count} = {table}.{count} + excluded.{count}'
+    )
+    params = [
+        (animal_id, resolution, connection.ops.adapt_datetimefield_value(start), amount)
+        for animal_id, start, amount in rows
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+def add_views(counts, when=None):
+    """Add ``{animal_id: views}`` to the hourly bucket containing ``when`` (default: now)."""
+    start = _floor(when or timezone.now(), 'hour')
+    _upsert('hour', [(pk, start, amount) for pk, amount in counts.items() if amount])
+
+
+def compact(now=None):
+    """Fold old hourly buckets into daily ones and expire old daily buckets.
+
+    Returns (hourly rows compacted, daily rows expired).
+    """
+    now = now or timezone.now()
+    hourly_cutoff = _floor(now - timedelta(hours=_setting('ZOO_TRENDING_HOURLY_RETENTION', 48)), 'hour')
+    daily_cutoff = _floor(now - timedelta(days=_setting('ZOO_TRENDING_DAILY_RETENTION', 30)), 'day')
+    with transaction.atomic():
+        old = AnimalViewBucket.objects.filter(resolution='hour', start__lt=hourly_cutoff)
+        totals = (
+            old.annotate(day=TruncDay('start', tzinfo=dt_timezone.utc))
+            .values('animal_id', 'day')
+            .annotate(total=Sum('count'))
+            .values_list('animal_id', 'day', 'total')
+        )
+        _upsert('day', list(totals))
+        compacted, _ = old.delete()
+        expired, _ = AnimalViewBucket.objects.filter(resolution='day', start__lt=daily_cutoff).delete()
+    return compacted, expired
+
+
+def _weights(window, now):
+    """Decay weight for every bucket start that can fall inside ``window``."""
+    length, half_life = WINDOWS[window]
+    since = now - length
+    weights = []
+    for resolution, size in RESOLUTIONS.items():
+        start = _floor(since, resolution)
+        while start <= now:
+            # Age is measured from the middle of the bucket.
+            age = max(now - (start + size / 2), timedelta(0))
+            weights.append((resolution, start, 0.5 ** (age / half_life)))
+            start += size
+    return weights
+
+
+def _animal(animal, views, score):
+    return {
+        'pk': animal.pk,
+        'name': animal.name,
+        'species': animal.species,
+        'image': {'url': animal.image.url} if animal.image else None,
+        'views': views,
+        'score': round(score, 3),
+    }
+
+
+def compute(window=DEFAULT_WINDOW, limit=10, now=None):
+    now = now or timezone.now()
+    weights = _weights(window, now)
+    since = now - WINDOWS[window][0]
+    in_window = (
+        Q(resolution='hour', start__gte=_floor(since, 'hour'))
+        | Q(resolution='day', start__gte=_floor(since, 'day'))
+    )
+    score = Sum(
+        Case(
+            *[When(resolution=resolution, start=start, then=F('count') * Value(weight))
+              for resolution, start, weight in weights],
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    )
+    rows = list(
+        AnimalViewBucket.objects.filter(in_window)
+        .values('animal_id')
+        .annotate(views=Sum('count'), score=score)
+        .order_by('-score', 'animal_id')
+        .values_list('animal_id', 'views', 'score')[:limit]
+    )
+    animals = Animal.objects.only('name', 'species', 'image').in_bulk([pk for pk, _, _ in rows])
+    return [_animal(animals[pk], views, score) for pk, views, score in rows if pk in animals]
+
+
+def trending(window=DEFAULT_WINDOW, limit=10):
+    """Cached ranking of the ``limit`` most viewed animals over ``window`` (one of WINDOWS)."""
+    if window not in WINDOWS:
+        raise ValueError(f'Unknown trending window: {window!r}')
+    key = f'{CACHE_KEY_PREFIX}{window}:{limit}'
+    result = cache.get(key)
+    if result is None:
+        result = compute(window, limit)
+        cache.set(key, result, _setting('ZOO_TRENDING_CACHE_TIMEOUT', 60))
+    return result
@@ -7,9 +7,15 @@ urlpatterns = [
     path('dashboard/', views.dashboard, name='dashboard'),
     path('register/', views.register, name='register'),
     path('animals/', views.category_list, name='animal_list'),
+    path('animals/cards/', views.animal_cards, name='animal_cards'),
     path('category/<slug:slug>/', views.category_list, name='category_detail'),
+    path('animals/trending/', views.trending_animals, name='trending_animals'),
     path('animal/<int:pk>/', views.animal_detail, name='animal_detail'),
+    path('animal/<int:pk>/media/<str:field>/', views.animal_media, name='animal_media'),
     path('animal/<int:pk>/favorite/', views.favorite_toggle, name='favorite_toggle'),
+    path('api/<str:resource>/', views.api_list, name='api_list'),
+    path('api/<str:resource>/batch/', views.api_batch, name='api_batch'),
+    path('api/<str:resource>/<int:pk>/', views.api_detail, name='api_detail'),
     path('manage-animals/', views.manage_animals, name='manage_animals'),
     path('animals/add/', views.animal_add, name='animal_add'),
     path('animals/<int:pk>/edit/', views.animal_edit, name='animal_edit'),
@@ -22,4 +28,5 @@ urlpatterns = [
     path('favorites/', views.favorites_list, name='favorites_list'),
     path('feedback/', views.submit_feedback, name='submit_feedback'),
     path('admin/feedback/', views.feedback_list, name='feedback_list'),
+    path('exports/<str:kind>/', views.export_data, name='export_data'),
 ]
@@ -1,11 +1,16 @@
 from django.shortcuts import render, get_object_or_404, redirect
+from django.http import Http404, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from .models import Animal, Category, Zone, Blog, Feedback, Quiz, Fact, Favorite
 from .forms import RegisterForm, AnimalForm, BlogForm, FeedbackForm, ContactForm
-from django.core.mail import send_mail
+from . import api, exports, favorites, media, recommend, tasks, trending
+from . import quiz as quiz_engine
+from .jobs import enqueue
 from django.conf import settings
+import json
 
 def contact(request):
     sent = False
@@ -27,35 +32,39 @@ def contact(request):
             message = f"From: {cd['name']} <{cd['email']}>,\nUrgency: {cd.get('urgency', 'Normal')}\n\n{cd['message']}"
             recipient = getattr(settings, 'ZOO_CONTACT_EMAIL', None) or getattr(settings, 'DEFAULT_FROM_EMAIL', None)
             if recipient:
-                send_mail(subject, message, cd['email'], [recipient])
+                # Delivered by the runjobs worker so a slow SMTP server never blocks the request.
+                enqueue(tasks.send_mail, subject=subject, message=message, from_email=cd['email'], recipient_list=[recipient])
             sent = True
     else:
         form = ContactForm()
     return render(request, 'zoo/contact.html', {'form': form, 'sent': sent})
+from .conditional import detail_condition
+from .dashboard import get_snapshot
 from .decorators import role_required
+from .pagecache import cache_anonymous_page
+from .pagination import CURSOR_PARAMS, paginate
+from .roles import get_role
+from .search import search
+from .stats import get_site_stats
 
 
+@cache_anonymous_page(Animal, Blog, Category, Fact, Feedback, Quiz, Zone, params=('q', 'trending'))
 def home(request):
-    featured = Animal.objects.all().order_by('-created_at')[:6]
     categories = Category.objects.all()
     facts = Fact.objects.all()[:3]
     blogs = Blog.objects.filter(approved=True).order_by('-date_posted')[:3]
     q = request.GET.get('q')
     if q:
-        animals = Animal.objects.filter(name__icontains=q) | Animal.objects.filter(species__icontains=q)
+        animals = search(q)
     else:
         animals = None
     # Show the most recent animals as featured (for the carousel)
     featured_animals = Animal.objects.order_by('-created_at')[:6]
-    stats = {
-        'animals': Animal.objects.count(),
-        'categories': Category.objects.count(),
-        'zones': Zone.objects.count(),
-        'quizzes': Quiz.objects.count(),
-        'blogs': Blog.objects.count(),
-        'feedback': Feedback.objects.count(),
-    }
-    feedbacks = Feedback.objects.order_by('-created_at')[:5]
+    stats = get_site_stats()
+    trending_window = request.GET.get('trending')
+    if trending_window not in trending.WINDOWS:
+        trending_window = trending.DEFAULT_WINDOW
+    feedbacks = Feedback.objects.select_related('user').order_by('-created_at')[:5]
     from datetime import datetime
     year = datetime.now().year
     return render(request, 'zoo/home.html', {
@@ -64,12 +73,20 @@ def home(request):
         'facts': facts,
         'blogs': blogs,
         'animals': animals,
+        'q': q,
         'stats': stats,
+        'trending': trending.trending(trending_window, 6),
+        'trending_window': trending_window,
+        'trending_windows': list(trending.WINDOWS),
         'feedbacks': feedbacks,
         'year': year,
     })
 
 
+ANIMAL_ORDERING = ('-created_at', '-id')
+
+
+@cache_anonymous_page(Animal, Category, params=CURSOR_PARAMS)
 def category_list(request, slug=None):
     category = None
     animals = None
@@ -78,15 +95,105 @@ def category_list(request, slug=None):
         animals = category.animals.all()
     else:
         animals = Animal.objects.all()
-    return render(request, 'zoo/animal_list.html', {'animals': animals, 'category': category})
+    animals = paginate(request, animals, ANIMAL_ORDERING)
+    return render(request, 'zoo/animal_list.html', {
+        'animals': animals,
+        'category': category,
+        'favorite_ids': favorites.favorite_ids(request.user),
+    })
 
 
+def animal_cards(request):
+    """Next page of animal_list cards as an HTML fragment, for infinite scroll."""
+    animals = Animal.objects.all()
+    slug = request.GET.get('category')
+    if slug:
+        animals = animals.filter(category__slug=slug)
+    page = paginate(request, animals, ANIMAL_ORDERING)
+    next_url = None
+    if page.has_next:
+        next_url = f"{request.path}?{page.next_query}"
+    html = render_to_string('zoo/animal_cards.html', {
+        'animals': page,
+        'favorite_ids': favorites.favorite_ids(request.user),
+    }, request=request)
+    return JsonResponse({'html': html, 'next_url': next_url})
+
+
+def trending_animals(request):
+    """JSON ranking of trending animals: ?window=1h|24h|7d&limit=N."""
+    window = request.GET.get('window', trending.DEFAULT_WINDOW)
+    if window not in trending.WINDOWS:
+        return HttpResponseBadRequest(f"window must be one of: {', '.join(trending.WINDOWS)}")
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 50)
+    except ValueError:
+        return HttpResponseBadRequest('limit must be an integer')
+    return JsonResponse({'window': window, 'results': trending.trending(window, limit)})
+
+
+def _api_resource(resource):
+    if resource not in api.RESOURCES:
+        raise Http404
+    return api.RESOURCES[resource]
+
+
+def api_list(request, resource):
+    """Cursor-paginated list: ?fields=a,b&per_page=N&after=/before=<cursor>."""
+    resource = _api_resource(resource)
+    try:
+        names = api.parse_fields(resource, request.GET.get('fields'))
+        per_page = min(max(int(request.GET.get('per_page', 25)), 1), settings.ZOO_API_MAX_PAGE_SIZE)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    return api.json_response(request, api.list_page(request, resource, names, per_page))
+
+
+def api_batch(request, resource):
+    """Several objects in one query: ?ids=1,2,3 (results follow the order of ids)."""
+    resource = _api_resource(resource)
+    try:
+        names = api.parse_fields(resource, request.GET.get('fields'))
+        ids = api.parse_ids(resource, request.GET.get('ids', ''))
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    results, missing = api.get_many(resource, ids, names)
+    return api.json_response(request, {'results': results, 'missing': missing})
+
+
+def api_detail(request, resource, pk):
+    resource = _api_resource(resource)
+    if not api.valid_id(resource, pk):
+        raise Http404
+    try:
+        names = api.parse_fields(resource, request.GET.get('fields'))
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    results, _ = api.get_many(resource, [pk], names)
+    if not results:
+        raise Http404
+    return api.json_response(request, results[0])
+
+
+@detail_condition(Animal)
 def animal_detail(request, pk):
-    animal = get_object_or_404(Animal, pk=pk)
-    is_fav = False
-    if request.user.is_authenticated:
-        is_fav = Favorite.objects.filter(user=request.user, animal=animal).exists()
-    return render(request, 'zoo/animal_detail.html', {'animal': animal, 'is_fav': is_fav})
+    animal = get_object_or_404(Animal.objects.select_related('category', 'zone'), pk=pk)
+    is_fav = animal.pk in favorites.favorite_ids(request.user)
+    return render(request, 'zoo/animal_detail.html', {
+        'animal': animal,
+        'is_fav': is_fav,
+        'also_liked': recommend.also_liked(pk),
+    })
+
+
+def animal_media(request, pk, field):
+    """Stream an animal's video or sound, with Range support for seeking."""
+    if field not in ('video', 'sound'):
+        raise Http404
+    name = Animal.objects.filter(pk=pk).values_list(field, flat=True).first()
+    if not name:
+        raise Http404
+    return media.serve(request, name)
 
 
 def register(request):
@@ -109,45 +216,42 @@ def register(request):
 
 @login_required
 def favorite_toggle(request, pk):
-    animal = get_object_or_404(Animal, pk=pk)
-    fav, created = Favorite.objects.get_or_create(user=request.user, animal=animal)
-    if not created:
-        fav.delete()
+    if not Animal.objects.filter(pk=pk).exists():
+        raise Http404
+    favorites.toggle(request.user, pk)
     return redirect('animal_detail', pk=pk)
 
 
 @login_required
 def favorites_list(request):
     favorites = Favorite.objects.filter(user=request.user).select_related('animal')
+    favorites = paginate(request, favorites, ('-id',))
     return render(request, 'zoo/favorites.html', {'favorites': favorites})
 
 
 @login_required
 def dashboard(request):
-    profile = getattr(request.user, 'profile', None)
-    role = profile.role if profile else 'visitor'
-    animal_count = Animal.objects.count()
-    category_count = Category.objects.count()
-    zone_count = Zone.objects.count()
-    blog_count = Blog.objects.count()
-    recent_animals = Animal.objects.order_by('-created_at')[:5]
-    recent_blogs = Blog.objects.order_by('-date_posted')[:5]
-    most_viewed_animals = Animal.objects.order_by('-view_count')[:5]
-    recent_feedback = Feedback.objects.order_by('-created_at')[:5]
-    import json
-    categories = Category.objects.all()
-    category_labels_json = json.dumps([cat.name for cat in categories])
-    category_counts_json = json.dumps([cat.animals.count() for cat in categories])
+    role = get_role(request) or 'visitor'
+    stats = get_site_stats()
+    animal_count = stats['animals']
+    category_count = stats['categories']
+    zone_count = stats['zones']
+    blog_count = stats['blogs']
+    snapshot = get_snapshot()
+    categories = snapshot['category_counts']
+    category_labels_json = json.dumps([name for name, count in categories])
+    category_counts_json = json.dumps([count for name, count in categories])
     context = {
         'role': role,
         'animal_count': animal_count,
         'category_count': category_count,
         'zone_count': zone_count,
         'blog_count': blog_count,
-        'recent_animals': recent_animals,
-        'recent_blogs': recent_blogs,
-        'most_viewed_animals': most_viewed_animals,
-        'recent_feedback': recent_feedback,
+        'recent_animals': snapshot['recent_animals'],
+        'recent_blogs': snapshot['recent_blogs'],
+        'most_viewed_animals': snapshot['most_viewed_animals'],
+        'most_loved_animals': snapshot['most_loved_animals'],
+        'recent_feedback': snapshot['recent_feedback'],
         'category_labels_json': category_labels_json,
         'category_counts_json': category_counts_json,
     }
@@ -156,7 +260,7 @@ def dashboard(request):
 
 @role_required(['admin', 'zookeeper'])
 def manage_animals(request):
-    animals = Animal.objects.all().order_by('-created_at')
+    animals = paginate(request, Animal.objects.all(), ANIMAL_ORDERING)
     return render(request, 'zoo/manage_animals.html', {'animals': animals})
 
 
@@ -236,65 +340,66 @@ def blog_delete(request, pk):
     return render(request, 'zoo/blog_confirm_delete.html', {'blog': blog})
 
 
+@cache_anonymous_page(Category)
 def categories(request):
     categories = Category.objects.all()
     return render(request, 'zoo/category_list.html', {'categories': categories})
 
 
+@cache_anonymous_page(Zone)
 def zone_map(request):
     zones = Zone.objects.all()
     return render(request, 'zoo/zone_map.html', {'zones': zones})
 
 
 def take_quiz(request):
-    from .models import Quiz
-    quizzes = Quiz.objects.all()[:5]
-    quiz_count = quizzes.count()
     feedback = None
     results = {}
     if request.method == 'POST':
-        score = 0
-        total = quizzes.count()
-        for quiz in quizzes:
-            user_answer = request.POST.get(f'quiz_{quiz.id}')
-            if user_answer:
-                is_correct = user_answer.strip() == quiz.correct_answer.strip()
-                results[quiz.id] = {
-                    'question': quiz.question,
-                    'user_answer': user_answer,
-                    'correct_answer': quiz.correct_answer,
-                    'is_correct': is_correct
-                }
-                if is_correct:
-                    score += 1
-            else:
-                results[quiz.id] = {
-                    'question': quiz.question,
-                    'user_answer': None,
-                    'correct_answer': quiz.correct_answer,
-                    'is_correct': False
-                }
+        # Grade the questions that were shown, then let the next visit resample.
+        quizzes = quiz_engine.take_pinned(request.session)
+        if quizzes is None:
+            # Expired session or a resubmitted form: answers for questions
+            # that were never shown cannot be graded, so show a new quiz.
+            messages.info(request, 'Your quiz expired. Here is a new set of questions.')
+            return redirect('take_quiz')
+        results, score = quiz_engine.grade(quizzes, request.POST)
         feedback = {
             'score': score,
-            'total': total
+            'total': len(quizzes)
         }
+    else:
+        quizzes = quiz_engine.pinned_questions(
+            request.session,
+            category=request.GET.get('category'),
+            difficulty=request.GET.get('difficulty'),
+            resample=True,
+        )
     return render(request, 'zoo/quiz.html', {
         'quizzes': quizzes,
-        'quiz_count': quiz_count,
+        'quiz_count': len(quizzes),
         'results': results,
-        'feedback': feedback
+        'feedback': feedback,
+        'difficulty': request.GET.get('difficulty', ''),
+        'difficulty_choices': Quiz.DIFFICULTY_CHOICES,
     })
 
 
+# Cards show the pre-rendered excerpt; never load the full content for a list.
+BLOG_LIST_FIELDS = ('title', 'excerpt', 'reading_time', 'date_posted', 'author__username')
+
+
+@cache_anonymous_page(Blog, params=CURSOR_PARAMS)
 def blog_list(request):
-    from .models import Blog
-    blogs = Blog.objects.filter(approved=True).order_by('-date_posted')
+    blogs = Blog.objects.filter(approved=True).select_related('author').only(*BLOG_LIST_FIELDS)
+    blogs = paginate(request, blogs, ('-date_posted', '-id'))
     return render(request, 'zoo/blog_list.html', {'blogs': blogs})
 
 
+@detail_condition(Blog)
+@cache_anonymous_page(Blog)
 def blog_detail(request, pk):
-    from .models import Blog
-    blog = Blog.objects.get(pk=pk)
+    blog = get_object_or_404(Blog.objects.select_related('author'), pk=pk)
     return render(request, 'zoo/blog_detail.html', {'blog': blog})
 
 
@@ -315,5 +420,27 @@ def submit_feedback(request):
 
 @role_required(['admin'])
 def feedback_list(request):
-    feedbacks = Feedback.objects.select_related('user').order_by('-created_at')
+    feedbacks = paginate(request, Feedback.objects.select_related('user'), ('-created_at', '-id'))
     return render(request, 'zoo/feedback_list.html', {'feedbacks': feedbacks})
+
+
+@role_required(['admin'])
+def export_data(request, kind):
+    if kind not in exports.EXPORTS:
+        raise Http404
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in exports.FORMATS:
+        return HttpResponseBadRequest('format must be csv or jsonl')
+    gzip = request.GET.get('gzip') == '1'
+    filters = {'since': request.GET.get('since'), 'until': request.GET.get('until')}
+    try:
+        for bound in ('min_rating', 'max_rating'):
+            if request.GET.get(bound):
+                filters[bound] = int(request.GET[bound])
+        chunks = exports.iter_export(kind, fmt, gzip=gzip, **filters)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    response = StreamingHttpResponse(chunks, content_type=exports.FORMATS[fmt][1])
+    filename = f'{kind}.{fmt}' + ('.gz' if gzip else '')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response